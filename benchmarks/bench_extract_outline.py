@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for PDFOutlineExtractor.extract_outline.
+
+Runs every document of the real input/ corpus plus a set of synthetic PDFs with
+controlled page counts, spans per page, font mixes and heading densities. Each
+document is measured in a fresh process and reported with per-stage timings
+(title, spans, body style, classification, leveling, tree build), pages/sec and
+peak RSS, as one JSON object per line.
+
+Usage: python benchmarks/bench_extract_outline.py [--corpus DIR] [--repeat N] [--large] [--json-out FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import round1a_outline_extractor  # noqa: E402
+from round1a_outline_extractor import EXTRACTOR_VERSION, PDFOutlineExtractor  # noqa: E402
+from measure import peak_rss_kib, run_in_fresh_process  # noqa: E402
+from synthetic import generate_pdf  # noqa: E402
+
+# name -> generate_pdf keyword arguments
+SYNTHETIC_CASES = {
+    "short_3p": dict(pages=3, spans_per_page=40),
+    "medium_100p": dict(pages=100, spans_per_page=45),
+    "dense_headings_100p": dict(pages=100, spans_per_page=45, heading_density=0.4),
+    "font_mix_100p": dict(pages=100, spans_per_page=45, body_fonts=("helv", "tiro", "cour")),
+    "many_sizes_50p": dict(pages=50, spans_per_page=45, heading_density=0.3,
+                           heading_sizes=(11.98, 12.0, 12.02, 13, 14, 15.5, 16, 18, 20, 22)),
+}
+LARGE_CASES = {
+    "large_1000p": dict(pages=1000, spans_per_page=45),
+}
+
+STAGES = ("title", "spans", "body_style", "classification", "leveling", "tree")
+
+
+def time_stages(pdf_path: str):
+    """Runs the extract_outline stages one by one and returns (seconds per stage, counts)."""
+    extractor = PDFOutlineExtractor()
+    timings = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+        return result
+
+    with fitz.open(pdf_path) as doc:
+        pages = len(doc)
+        # The pipeline derives the title inside the span pass; extract_title is timed
+        # separately so the cost of a standalone first-page parse stays visible.
+        timed("title", extractor.extract_title, doc)
+        _, spans = timed("spans", extractor._get_text_spans, doc)
+    body_font_size, _ = timed("body_style", extractor._get_body_text_style, spans)
+    heading_indices = timed("classification", extractor._find_headings, spans, body_font_size)
+    headings = timed("leveling", extractor._assign_heading_levels, (spans.row(i) for i in heading_indices))
+    timed("tree", extractor._build_hierarchical_outline, headings)
+    return timings, {"pages": pages, "spans": len(spans), "headings": len(headings)}
+
+
+def measure(pdf_path: str, repeat: int):
+    """Child process: best-of-`repeat` stage timings plus the end-to-end extract_outline time."""
+    best = None
+    for _ in range(repeat):
+        timings, counts = time_stages(pdf_path)
+        if best is None or sum(timings.values()) < sum(best.values()):
+            best = timings
+
+    extractor = PDFOutlineExtractor()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        extractor.extract_outline(pdf_path)
+    total = (time.perf_counter() - start) / repeat
+
+    return {
+        **counts,
+        "stages": {stage: best.get(stage, 0.0) for stage in STAGES},
+        "extract_outline_seconds": total,
+        "pages_per_sec": counts["pages"] / total if total else None,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(ROOT / "input"), help="directory of real PDFs (default: input/)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per document (default: 3)")
+    parser.add_argument("--large", action="store_true", help="also run the 1000-page synthetic case")
+    parser.add_argument("--json-out", help="also write all results as one JSON document to this file")
+    args = parser.parse_args()
+
+    environment = {
+        "extractor_version": EXTRACTOR_VERSION,
+        "python": platform.python_version(),
+        "pymupdf": fitz.VersionBind,
+        "numpy": round1a_outline_extractor.np is not None,
+    }
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = [("corpus", p.name, str(p)) for p in sorted(Path(args.corpus).glob("*.pdf"))]
+        cases = dict(SYNTHETIC_CASES, **(LARGE_CASES if args.large else {}))
+        for name, params in cases.items():
+            documents.append(("synthetic", name, generate_pdf(os.path.join(tmp, f"{name}.pdf"), **params)))
+
+        for source, name, pdf_path in documents:
+            record = {"source": source, "document": name, **run_in_fresh_process(measure, pdf_path, args.repeat)}
+            results.append(record)
+            print(json.dumps(record), flush=True)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
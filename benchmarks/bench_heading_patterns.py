@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: heading text classification (_is_heading_text) with the fused,
+precompiled pattern matcher vs. the previous per-pattern re.match loop, on
+synthetic span texts.
+
+Both are run with the built-in patterns and with extra registered numbering
+patterns, and must agree on every text. Results are printed as JSON lines.
+
+Usage: python benchmarks/bench_heading_patterns.py [--texts N] [--seed N]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from round1a_outline_extractor import PDFOutlineExtractor  # noqa: E402
+
+WORDS = ["market", "river", "garden", "harbor", "alpha", "beta", "history", "cuisine", "travel", "notes"]
+
+EXTRA_PATTERNS = [
+    r'^[IVXLC]+\.\s+\S',                    # "IV. Results"
+    r'^Appendix\s+[A-Z]\b',                 # "Appendix B"
+    r'^Chapitre\s+\d+',                     # "Chapitre 3"
+    r'^Kapitel\s+\d+',                      # "Kapitel 3"
+    r'^Cap[ií]tulo\s+\d+',                  # "Capítulo 3"
+    r'^Part\s+[IVX]+\b',                    # "Part II"
+    r'^[A-Z]\.\d+(\.\d+)*\s+\S',            # "A.1 Setup"
+    r'^§\s*\d+',                            # "§ 12"
+]
+
+
+def legacy_is_heading_text(patterns, text: str) -> bool:
+    """The classifier before the fused matcher: one re.match per pattern, repeated splits."""
+    if text.endswith('.') or text.endswith(':'):
+        text = text[:-1]
+    for pattern in patterns:
+        if re.match(pattern, text):
+            return True
+    if text.istitle() and len(text.split()) > 1 and len(text.split()) < 10:
+        return True
+    if text.isupper() and len(text.split()) > 1 and len(text.split()) < 10:
+        return True
+    return False
+
+
+def synthetic_texts(count: int, seed: int):
+    """Span texts mixing body sentences, numbered, title-case, all-caps and extra-pattern headings."""
+    rng = random.Random(seed)
+
+    def words(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    makers = [
+        lambda: words(rng.randint(6, 20)).capitalize() + ".",
+        lambda: words(rng.randint(6, 20)).capitalize() + ",",
+        lambda: f"{rng.randint(1, 9)}.{rng.randint(1, 9)} {words(3).title()}",
+        lambda: f"Chapter {rng.randint(1, 30)}: {words(2).title()}",
+        lambda: words(rng.randint(2, 6)).title(),
+        lambda: words(rng.randint(2, 6)).upper(),
+        lambda: f"{rng.choice(['II', 'IV', 'XI'])}. {words(2).title()}",
+        lambda: f"Appendix {rng.choice('ABC')} {words(2)}",
+        lambda: f"Chapitre {rng.randint(1, 12)} {words(2)}",
+    ]
+    weights = [40, 20, 8, 4, 10, 6, 4, 4, 4]
+    return [rng.choices(makers, weights)[0]() for _ in range(count)]
+
+
+def time_classifier(classify, texts):
+    start = time.perf_counter()
+    results = [classify(text) for text in texts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=1_000_000, help="number of synthetic span texts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.texts, args.seed)
+    for name, extra in (("builtin", []), ("builtin+extra", EXTRA_PATTERNS)):
+        extractor = PDFOutlineExtractor()
+        for pattern in extra:
+            extractor.register_heading_pattern(pattern)
+        patterns = list(extractor.heading_patterns)
+        matcher = extractor._heading_matcher()
+
+        legacy_seconds, legacy = time_classifier(lambda text: legacy_is_heading_text(patterns, text), texts)
+        fused_seconds, fused = time_classifier(lambda text: extractor._is_heading_text(text, matcher), texts)
+        if legacy != fused:
+            raise SystemExit(f"{name}: fused matcher disagrees with the per-pattern loop")
+        print(json.dumps({
+            "patterns": name,
+            "pattern_count": len(patterns),
+            "texts": len(texts),
+            "headings": sum(fused),
+            "legacy_seconds": round(legacy_seconds, 3),
+            "fused_seconds": round(fused_seconds, 3),
+            "speedup": round(legacy_seconds / fused_seconds, 2),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS and time of extract_outline for the path, bytes and mmap
+input modes on a large synthetic PDF (text plus incompressible images).
+
+Each mode runs in a fresh process; results are printed as JSON lines.
+"mmap_buffer" tells whether this PyMuPDF build is given the mapping itself.
+
+Usage: python benchmarks/bench_input_modes.py [--pages N] [--images-per-page N] [--pdf FILE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from round1a_outline_extractor import _FITZ_OPENS_BUFFERS, INPUT_MODES, PDFOutlineExtractor  # noqa: E402
+from measure import peak_rss_kib, run_in_fresh_process  # noqa: E402
+from synthetic import generate_pdf  # noqa: E402
+
+
+def measure(pdf_path: str, input_mode: str):
+    """Child process: one extract_outline call in the given input mode."""
+    baseline_kib = peak_rss_kib()
+    extractor = PDFOutlineExtractor(input_mode=input_mode)
+    start = time.perf_counter()
+    extractor.extract_outline(pdf_path)
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_kib": peak_rss_kib(),
+        "rss_growth_kib": peak_rss_kib() - baseline_kib,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="benchmark this PDF instead of generating one")
+    parser.add_argument("--pages", type=int, default=40, help="synthetic pages (default: %(default)s)")
+    parser.add_argument("--images-per-page", type=int, default=2,
+                        help="~3 MB images per synthetic page (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generate in a child too, so this process stays small
+        pdf_path = args.pdf or run_in_fresh_process(generate_pdf, os.path.join(tmp, "large.pdf"), pages=args.pages,
+                                                    images_per_page=args.images_per_page)
+        size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+        for input_mode in INPUT_MODES:
+            print(json.dumps({
+                "file": os.path.basename(pdf_path),
+                "size_mb": round(size_mb, 1),
+                "input_mode": input_mode,
+                "pymupdf": fitz.VersionBind,
+                # Without buffer support, mmap mode opens the file by path
+                "mmap_buffer": _FITZ_OPENS_BUFFERS,
+                **run_in_fresh_process(measure, pdf_path, input_mode),
+            }), flush=True)
+
+
+if __name__ == "__main__":
+    main()
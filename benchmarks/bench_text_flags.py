@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: get_text("dict") with default flags vs. the text-only flags used by
+PDFOutlineExtractor (image blocks are not materialised).
+
+Each (document, mode) pair runs in a fresh process so peak RSS is not shared.
+Results are printed as one JSON object per line.
+
+Usage: python benchmarks/bench_text_flags.py [pdf_dir] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from round1a_outline_extractor import TEXT_ONLY_FLAGS  # noqa: E402
+from measure import peak_rss_kib, run_in_fresh_process  # noqa: E402
+from synthetic import generate_pdf  # noqa: E402
+
+MODES = {
+    "default": None,
+    "text_only": TEXT_ONLY_FLAGS,
+}
+
+
+def measure(pdf_path: str, flags, repeat: int):
+    """Child process: parses every page `repeat` times and reports time and peak RSS."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                if flags is None:
+                    page.get_text("dict")
+                else:
+                    page.get_text("dict", flags=flags)
+    return {"seconds": time.perf_counter() - start, "peak_rss_kib": peak_rss_kib()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf_dir", nargs="?", default=str(Path(__file__).resolve().parent.parent / "input"))
+    parser.add_argument("--repeat", type=int, default=5, help="parses per measurement (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = sorted(str(p) for p in Path(args.pdf_dir).glob("*.pdf"))
+        synthetic = os.path.join(tmp, "synthetic_image_heavy.pdf")
+        generate_pdf(synthetic, pages=6, spans_per_page=2, heading_density=0.5, images_per_page=2)
+        pdfs.append(synthetic)
+
+        for pdf_path in pdfs:
+            results = {mode: run_in_fresh_process(measure, pdf_path, flags, args.repeat)
+                       for mode, flags in MODES.items()}
+            base, fast = results["default"], results["text_only"]
+            print(json.dumps({
+                "file": os.path.basename(pdf_path),
+                "modes": results,
+                "time_saved_pct": round(100 * (1 - fast["seconds"] / base["seconds"]), 1),
+                "rss_saved_kib": base["peak_rss_kib"] - fast["peak_rss_kib"],
+            }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Measurement helpers shared by the benchmark scripts."""
+
+import resource
+from multiprocessing import get_context
+
+
+def peak_rss_kib() -> int:
+    """
+    Peak resident set size of this process in KiB.
+
+    Reads VmHWM from /proc on Linux: unlike ru_maxrss it is reset by exec, so a
+    freshly spawned child does not inherit the parent's high-water mark.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _call(target, args, kwargs, queue):
+    queue.put(target(*args, **kwargs))
+
+
+def run_in_fresh_process(target, *args, **kwargs):
+    """Runs target(*args, **kwargs) in a newly spawned interpreter and returns its result."""
+    ctx = get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_call, args=(target, args, kwargs, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
@@ -0,0 +1,63 @@
+"""
+Synthetic PDF generator for benchmarks.
+
+Produces documents with a controlled number of pages, spans per page, body font
+mix and heading density, using only PyMuPDF's built-in Base-14 fonts.
+"""
+
+import os
+import random
+from typing import Sequence
+
+import fitz
+
+WORDS = (
+    "alpha beta gamma delta river stone market garden castle harbor festival "
+    "village coast wine lavender bridge museum valley tower square"
+).split()
+
+PAGE_HEIGHT = 842
+LINE_HEIGHT = 16
+TOP_MARGIN = 50
+
+
+def generate_pdf(path: str, pages: int = 10, spans_per_page: int = 40, heading_density: float = 0.1,
+                 body_fonts: Sequence[str] = ("helv",), body_size: float = 11,
+                 heading_sizes: Sequence[float] = (18, 14, 12.5), images_per_page: int = 0,
+                 seed: int = 0) -> str:
+    """
+    Writes a synthetic PDF and returns its path.
+
+    Each page gets `spans_per_page` single-span lines; a `heading_density` fraction of
+    them are numbered, title-cased headings in bold at one of `heading_sizes`, the
+    rest are body sentences in one of `body_fonts`. `images_per_page` adds large
+    incompressible pictures, emulating image-heavy brochures.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    heading_count = 0
+    for page_num in range(pages):
+        page = doc.new_page(height=PAGE_HEIGHT)
+        y = TOP_MARGIN
+        if page_num == 0:
+            page.insert_text((50, y), "Synthetic Benchmark Document", fontsize=max(heading_sizes) + 6, fontname="hebo")
+            y += 2 * LINE_HEIGHT
+        for _ in range(spans_per_page):
+            if y > PAGE_HEIGHT - TOP_MARGIN:
+                break
+            if rng.random() < heading_density:
+                heading_count += 1
+                words = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 5)))
+                page.insert_text((50, y), f"{page_num + 1}.{heading_count} {words}",
+                                 fontsize=rng.choice(heading_sizes), fontname="hebo")
+            else:
+                sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))).capitalize() + "."
+                page.insert_text((50, y), sentence, fontsize=body_size, fontname=rng.choice(body_fonts))
+            y += LINE_HEIGHT
+        for i in range(images_per_page):
+            pix = fitz.Pixmap(fitz.csRGB, 1200, 900, os.urandom(1200 * 900 * 3), False)
+            top = 110 + (i % 2) * 340
+            page.insert_image(fitz.Rect(50, top, 545, top + 330), pixmap=pix)
+    doc.save(path)
+    doc.close()
+    return path
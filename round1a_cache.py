@@ -0,0 +1,127 @@
+"""
+Content-addressed on-disk cache for extracted outlines.
+
+Entries are keyed by the SHA-256 of the PDF bytes plus a fingerprint of the
+extractor configuration, so an unchanged file processed with the same settings
+is never parsed twice. The cache is bounded in size; the least recently used
+entries (by file mtime, refreshed on every hit) are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Returns $XDG_CACHE_HOME/round1a, falling back to ~/.cache/round1a."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "round1a"
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hashes a file in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutlineCache:
+    """Size-bounded LRU cache of outline JSON files in a directory."""
+
+    SUFFIX = ".json"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        # Running estimate of the cache size; None until the directory is first scanned
+        self._size: Optional[int] = None
+
+    def key(self, source: Union[str, bytes, bytearray], config: Dict[str, Any]) -> str:
+        """Builds the cache key for a PDF (file path or raw bytes) and an extractor configuration."""
+        config_hash = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+        pdf_hash = hashlib.sha256(source).hexdigest() if isinstance(source, (bytes, bytearray)) else file_sha256(source)
+        return f"{pdf_hash}-{config_hash[:16]}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached outline for a key, or None on a miss."""
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(entry)  # mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]):
+        """Stores an outline, then evicts old entries if the cache grew past max_bytes."""
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        # Write to a temporary file and rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._scan())
+        else:
+            self._size += len(payload)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _scan(self):
+        """Yields (mtime, size, path) for every cache entry."""
+        if not self.cache_dir.is_dir():
+            return
+        for entry in self.cache_dir.glob(f"*/*{self.SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield stat.st_mtime, stat.st_size, entry
+
+    def _evict(self):
+        """Removes least recently used entries until the cache is at 90% of max_bytes."""
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, entry in entries:
+            if total <= target:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def purge(self) -> int:
+        """Deletes every cache entry and returns how many were removed."""
+        removed = 0
+        for _, _, entry in list(self._scan()):
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:
+                pass
+        self._size = 0
+        return removed
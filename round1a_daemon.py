@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Long-running extraction daemon for Round 1A.
+
+Keeps a pool of warm worker processes, each holding its own PDFOutlineExtractor,
+and serves outline requests over local HTTP or a Unix domain socket:
+
+    POST /extract   {"path": "/abs/path/to/file.pdf"}  -> outline JSON
+    POST /extract   raw PDF body (Content-Type: application/pdf) -> outline JSON
+    GET  /health                                       -> pool and queue status
+
+Uploaded PDFs are parsed from memory and never written to disk.
+
+At most --max-queue requests are admitted at once (running or waiting for a
+worker); further requests are rejected with 503 and a Retry-After header so
+clients back off instead of piling up.
+
+If a worker dies (a MuPDF crash, the OOM killer), the request it was serving
+fails with 500 and the pool is rebuilt; /health reports "degraded" until the new
+workers are up. With --timeout every document runs in its own child process that
+is killed after that many seconds (answered with 504), so a runaway PDF cannot
+hold a worker forever.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Union
+
+from round1a_cache import OutlineCache, default_cache_dir
+from round1a_outline_extractor import (DocumentResult, PDFOutlineExtractor, _extract_in_worker,
+                                       _extract_isolated, _init_worker, _resolve_workers, _start_isolation_server)
+
+# Largest accepted JSON job description
+MAX_REQUEST_BYTES = 64 * 1024
+# Default limit for raw PDF uploads
+DEFAULT_MAX_UPLOAD_MB = 256
+
+
+def _warm_up() -> int:
+    """No-op job that forces a worker process to start and run its initializer."""
+    return os.getpid()
+
+
+class WorkerPoolError(RuntimeError):
+    """Raised when a job was lost because its worker process died."""
+
+
+class ExtractionService:
+    """A warm process pool plus the admission control shared by all request threads."""
+
+    def __init__(self, extractor: PDFOutlineExtractor, workers: int = 0, max_queue: int = 64):
+        self.extractor = extractor
+        self.workers = _resolve_workers(workers)
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        # Serialises pool rebuilds; never taken while holding _lock
+        self._pool_lock = threading.Lock()
+        self.executor = self._create_pool()
+        self.degraded = False
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    def _create_pool(self) -> Executor:
+        if self.extractor.timeout is not None:
+            # Threads only supervise; each document runs in a killable child process
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.extractor,))
+
+    def warm_up(self):
+        """Starts every worker up front so the first requests do not pay process spin-up."""
+        if self.extractor.timeout is not None:
+            _start_isolation_server()
+        for future in [self.executor.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+
+    def _restart_pool(self, broken: Executor):
+        """Replaces a broken pool (unless another thread already did) and warms the new one."""
+        with self._pool_lock:
+            if self.executor is broken:
+                with self._lock:
+                    self.degraded = True
+                    self.restarts += 1
+                broken.shutdown(wait=False)
+                self.executor = self._create_pool()
+            try:
+                self.warm_up()
+            except BrokenProcessPool:
+                return  # still degraded; the next request tries again
+            with self._lock:
+                self.degraded = False
+
+    def _run(self, source: Union[str, bytes]) -> DocumentResult:
+        executor = self.executor
+        try:
+            if self.extractor.timeout is not None:
+                return executor.submit(_extract_isolated, self.extractor, source).result()
+            return executor.submit(_extract_in_worker, source).result()
+        except BrokenProcessPool as e:
+            self._restart_pool(executor)
+            raise WorkerPoolError("worker process died; the pool was restarted") from e
+
+    def extract(self, source: Union[str, bytes]) -> Optional[DocumentResult]:
+        """
+        Runs one job on the pool; returns None when the queue is full and raises
+        WorkerPoolError when the worker died while running it.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            return None
+        with self._lock:
+            self.pending += 1
+        succeeded = False
+        try:
+            result = self._run(source)
+            succeeded = True
+            return result
+        finally:
+            with self._lock:
+                self.pending -= 1
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            self._slots.release()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"status": "degraded" if self.degraded else "ok", "workers": self.workers,
+                    "max_queue": self.max_queue, "pending": self.pending, "completed": self.completed,
+                    "failed": self.failed, "rejected": self.rejected, "restarts": self.restarts}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of the daemon; the service is attached to the server object."""
+
+    server_version = "Round1ADaemon/1.0"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _send_json(self, status: HTTPStatus, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(HTTPStatus.OK, self.server.service.status())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown endpoint {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid Content-Length"})
+            return
+        is_upload = self.headers.get_content_type() == "application/pdf"
+        if length > (self.server.max_upload_bytes if is_upload else MAX_REQUEST_BYTES):
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "request body too large"})
+            return
+
+        if is_upload:
+            # The upload goes to the worker as bytes and is parsed in memory
+            source = self.rfile.read(length)
+        else:
+            try:
+                job = json.loads(self.rfile.read(length) or b"{}")
+                source = job["path"]
+                if not isinstance(source, str):
+                    raise TypeError(source)
+            except (ValueError, KeyError, TypeError):
+                self._send_json(HTTPStatus.BAD_REQUEST,
+                                {"error": 'expected a PDF upload or a JSON body like {"path": "/file.pdf"}'})
+                return
+            if not os.path.isfile(source):
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": f"no such file: {source}"})
+                return
+
+        try:
+            result = self.server.service.extract(source)
+        except WorkerPoolError as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+        if result is None:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "queue full, retry later"},
+                            headers={"Retry-After": "1"})
+            return
+        if result.error and result.error.startswith("TimeoutError"):
+            self._send_json(HTTPStatus.GATEWAY_TIMEOUT, {"error": result.error})
+            return
+        if result.error and result.error.startswith("WorkerCrashed"):
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": result.error})
+            return
+        self._send_json(HTTPStatus.OK, result.outline)
+
+
+class ExtractionHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: ExtractionService, max_upload_bytes: int):
+        super().__init__(address, ExtractionRequestHandler)
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+
+
+class ExtractionUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: ExtractionService, max_upload_bytes: int):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a previous run
+        super().__init__(socket_path, ExtractionRequestHandler)
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port (default: %(default)s)")
+    parser.add_argument("--socket", help="serve on this Unix domain socket instead of TCP")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="warm worker processes (0 = one per CPU, default: 0)")
+    parser.add_argument("--max-queue", type=int, default=64,
+                        help="requests admitted at once before answering 503 (default: %(default)s)")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB,
+                        help="largest accepted PDF upload in MiB (default: %(default)s)")
+    parser.add_argument("--use-toc", action="store_true",
+                        help="use the PDF's embedded bookmarks as the outline when available")
+    parser.add_argument("--cache-dir", default=str(default_cache_dir()),
+                        help="directory of the outline result cache (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the result cache")
+    parser.add_argument("--timeout", type=float,
+                        help="kill the extraction of a document after this many seconds (answered with 504)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cache = None if args.no_cache else OutlineCache(args.cache_dir)
+    extractor = PDFOutlineExtractor(cache=cache, use_embedded_toc=args.use_toc, timeout=args.timeout)
+
+    service = ExtractionService(extractor, workers=args.workers, max_queue=args.max_queue)
+    service.warm_up()
+    if args.socket:
+        server = ExtractionUnixServer(args.socket, service, args.max_upload_mb * 1024 * 1024)
+        where = f"unix:{args.socket}"
+    else:
+        server = ExtractionHTTPServer((args.host, args.port), service, args.max_upload_mb * 1024 * 1024)
+        where = f"http://{args.host}:{server.server_address[1]}"
+
+    print(f"🚀 Serving outlines on {where} with {service.workers} warm worker(s)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
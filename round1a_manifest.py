@@ -0,0 +1,112 @@
+"""
+Checkpoint manifest for resumable Round 1A batch runs.
+
+The manifest is an append-only JSON Lines journal with one record per finished
+input (keyed by its resolved path): its size, mtime and SHA-256, the status ("ok" or "error"), the error
+message and the extraction time. Every record is appended with a single
+os.write on an O_APPEND descriptor, so a process killed at any point (even with
+kill -9) leaves at most one truncated last line, which is ignored on load.
+When a manifest is opened, it is compacted to the latest record per input and
+atomically replaced, so it does not grow across restarts.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from round1a_cache import file_sha256
+
+
+class CheckpointManifest:
+    """Records finished inputs and answers whether an input can be skipped."""
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = Path(path)
+        # fsync after every record additionally protects against power loss, at a cost
+        self.fsync = fsync
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self._compact()
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entries[record["input"]] = record
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn write from an interrupted run
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _compact(self):
+        """Rewrites the journal with only the latest record per input."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in self.entries.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _key(pdf_file: Path) -> str:
+        # Absolute, symlink-free path, so runs from other working directories or
+        # via differently spelled paths find the same entry
+        return str(Path(pdf_file).resolve())
+
+    def is_complete(self, pdf_file: Path, output_file: Optional[Path] = None) -> bool:
+        """
+        True if pdf_file finished successfully and is unchanged since.
+
+        Size and mtime are compared first; if only the mtime differs, the content
+        hash decides. A missing output file always means the input is redone.
+        """
+        record = self.entries.get(self._key(pdf_file))
+        if not record or record.get("status") != "ok":
+            return False
+        if output_file is not None and not output_file.exists():
+            return False
+        stat = pdf_file.stat()
+        if stat.st_size != record["size"]:
+            return False
+        if stat.st_mtime_ns == record["mtime_ns"]:
+            return True
+        return file_sha256(str(pdf_file)) == record["sha256"]
+
+    def record(self, pdf_file: Path, status: str, seconds: float, error: Optional[str] = None):
+        """Appends the result of one input to the journal."""
+        stat = pdf_file.stat()
+        record = {
+            "input": self._key(pdf_file),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(str(pdf_file)),
+            "status": status,
+            "error": error,
+            "seconds": round(seconds, 6),
+            "finished_at": time.time(),
+        }
+        os.write(self._fd, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        if self.fsync:
+            os.fsync(self._fd)
+        self.entries[record["input"]] = record
+
+    def close(self):
+        if self._fd is not None:
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,10 +1,287 @@
 import fitz  # PyMuPDF
+import copy
+import io
 import json
+import math
+import mmap
+import multiprocessing
+import multiprocessing.forkserver
 import re
 import os
-from typing import List, Dict, Any, Tuple
+import signal
+import sys
+import time
+from typing import List, Dict, Any, BinaryIO, Iterable, Iterator, NamedTuple, Optional, Set, Tuple, Union
 from pathlib import Path
-from collections import Counter
+from array import array
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+from contextlib import ExitStack, contextmanager, nullcontext, redirect_stdout
+
+from round1a_cache import OutlineCache
+from round1a_manifest import CheckpointManifest
+from round1a_output import OUTPUT_FORMATS, ResultStreamWriter, write_outline
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; heading classification falls back to a per-span loop
+    np = None
+
+# Version of the extraction heuristics. Bump it whenever a change alters the produced
+# outlines, so results cached by an older version are not reused.
+EXTRACTOR_VERSION = "1.1"
+
+# How PDF files given by path are handed to fitz: "path" lets MuPDF read the file itself,
+# "bytes" loads it into memory first, "mmap" maps it and passes the mapping as a buffer
+# where fitz accepts one (see _FITZ_OPENS_BUFFERS), and otherwise opens it like "path"
+INPUT_MODES = ("path", "bytes", "mmap")
+
+
+def _fitz_opens_buffers() -> bool:
+    """True if fitz.open(stream=...) accepts a memoryview rather than only bytes."""
+    with fitz.open() as probe:
+        probe.new_page()
+        data = probe.tobytes()
+    try:
+        fitz.open(stream=memoryview(data), filetype="pdf").close()
+    except Exception:
+        return False
+    return True
+
+
+# Some PyMuPDF releases (e.g. 1.23.x) only take bytes streams, where passing a mapping
+# would need a full copy of it; decided once, so mmap mode never pays a failed attempt
+_FITZ_OPENS_BUFFERS = _fitz_opens_buffers()
+
+# A PDF given as a filesystem path, as the raw file bytes (bytes, bytearray,
+# memoryview) or as a binary file-like object
+PDFSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+# get_text("dict") flags without TEXT_PRESERVE_IMAGES: image blocks (and their raw
+# image bytes) are never materialised, since only text spans are used.
+TEXT_ONLY_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+@lru_cache(maxsize=64)
+def _compile_heading_patterns(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Fuses heading patterns into one compiled alternation, so that matching a span costs
+    one regex call however many patterns are registered. re.match of the result
+    succeeds exactly when re.match of any single pattern would.
+    """
+    if not patterns:
+        return re.compile(r"(?!)")  # matches nothing
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+# Digit runs are blanked when comparing span texts across pages ("Page 3" ~ "Page 4")
+_DIGIT_RUNS = re.compile(r"\d+")
+
+# (normalized text, quantized y, font size, font) identifying repeated page furniture
+RepeatKey = Tuple[str, int, float, str]
+
+
+@lru_cache(maxsize=4096)
+def _font_flags(font: str) -> Tuple[bool, bool]:
+    """(is_bold, is_italic) of a font name, derived once per distinct font."""
+    name = font.lower()
+    return "bold" in name, "italic" in name or "oblique" in name
+
+
+class ExtractionLimitExceeded(Exception):
+    """Raised when a document exceeds the extractor's max_pages or max_spans budget."""
+
+
+class NullMetrics:
+    """
+    Instrumentation sink that records nothing.
+
+    This is the default for PDFOutlineExtractor.metrics; every hook is a no-op, so
+    disabled instrumentation costs one attribute lookup and call per stage.
+    """
+
+    enabled = False
+    _NULL_STAGE = nullcontext()
+
+    def stage(self, name: str):
+        """Returns a context manager that times the enclosed block as stage `name`."""
+        return self._NULL_STAGE
+
+    def count(self, name: str, n: int = 1):
+        """Adds n to counter `name`."""
+
+    def merge(self, data: Dict[str, Dict[str, float]]):
+        """Adds the timings and counters of an as_dict() snapshot."""
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {}
+
+
+class _StageTimer:
+    """Context manager adding the elapsed wall time to one stage of an ExtractionMetrics."""
+
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "ExtractionMetrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        timings = self.metrics.timings
+        timings[self.name] = timings.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class ExtractionMetrics(NullMetrics):
+    """Collects per-stage wall times (seconds) and counters for one or more documents."""
+
+    enabled = True
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def stage(self, name: str):
+        return _StageTimer(self, name)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, data: Dict[str, Dict[str, float]]):
+        for name, seconds in data.get("timings", {}).items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, n in data.get("counters", {}).items():
+            self.count(name, n)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+
+class Span:
+    """
+    One text span kept outside a SpanTable (heading candidates and headings).
+
+    A slotted record instead of a dict: about a third of the memory, and the font
+    name is interned so equal fonts share one string. level ("H1", "H2", ...) is set
+    by leveling, or given directly for bookmark headings.
+    """
+
+    __slots__ = ("text", "font_size", "font", "is_bold", "is_italic", "page", "level")
+
+    def __init__(self, text: str, font_size: float, font: str, page: int, level: Optional[str] = None):
+        self.text = text
+        self.font_size = font_size
+        self.font = sys.intern(font)
+        self.is_bold, self.is_italic = _font_flags(font)
+        self.page = page
+        self.level = level
+
+    def __repr__(self) -> str:
+        return f"Span(text={self.text!r}, font_size={self.font_size}, font={self.font!r}, page={self.page})"
+
+
+class SpanTable:
+    """
+    Columnar store for the text spans of a document.
+
+    Instead of one dict per span, each property lives in its own compact column:
+    font sizes (float64, so comparisons match the rounded Python floats exactly),
+    page numbers (int32), top y coordinates (float64), font names interned to
+    integer IDs, and all span texts
+    in one contiguous string addressed by offsets.
+    """
+
+    def __init__(self):
+        self.font_sizes = array('d')
+        self.pages = array('i')
+        self.y_positions = array('d')
+        self.font_ids = array('i')
+        # Interned fonts: id -> name, id -> bold / italic flag, name -> id
+        self.fonts: List[str] = []
+        self.font_is_bold: List[bool] = []
+        self.font_is_italic: List[bool] = []
+        self._font_index: Dict[str, int] = {}
+        # Text i is _text_buffer[_text_offsets[i]:_text_offsets[i + 1]]
+        self._text_offsets = array('q', [0])
+        self._text_writer = io.StringIO()
+        self._text_buffer: Optional[str] = ""
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_text_buffer"] = self._texts()
+        del state["_text_writer"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._text_writer = io.StringIO()
+        self._text_writer.write(self._text_buffer)
+
+    def font_id(self, font: str) -> int:
+        """Returns the interned ID of a font name, registering it on first use."""
+        font_id = self._font_index.get(font)
+        if font_id is None:
+            font_id = len(self.fonts)
+            self._font_index[font] = font_id
+            self.fonts.append(font)
+            is_bold, is_italic = _font_flags(font)
+            self.font_is_bold.append(is_bold)
+            self.font_is_italic.append(is_italic)
+        return font_id
+
+    def append(self, text: str, font_size: float, font: str, page: int, y: float = 0.0):
+        """Adds one span."""
+        self._text_writer.write(text)
+        self._text_offsets.append(self._text_offsets[-1] + len(text))
+        self._text_buffer = None
+        self.font_sizes.append(font_size)
+        self.pages.append(page)
+        self.y_positions.append(y)
+        self.font_ids.append(self.font_id(font))
+
+    def extend(self, other: "SpanTable"):
+        """Appends all spans of another table, remapping its font IDs."""
+        font_map = [self.font_id(font) for font in other.fonts]
+        base = self._text_offsets[-1]
+        self._text_writer.write(other._texts())
+        self._text_offsets.extend(base + offset for offset in other._text_offsets[1:])
+        self._text_buffer = None
+        self.font_sizes.extend(other.font_sizes)
+        self.pages.extend(other.pages)
+        self.y_positions.extend(other.y_positions)
+        self.font_ids.extend(font_map[font_id] for font_id in other.font_ids)
+
+    def _texts(self) -> str:
+        """Returns the contiguous text buffer, materialising pending appends."""
+        if self._text_buffer is None:
+            self._text_buffer = self._text_writer.getvalue()
+        return self._text_buffer
+
+    def text(self, i: int) -> str:
+        """Returns the text of span i."""
+        return self._texts()[self._text_offsets[i]:self._text_offsets[i + 1]]
+
+    def iter_texts(self) -> Iterator[str]:
+        """Yields every span text in order."""
+        buffer = self._texts()
+        offsets = self._text_offsets
+        for i in range(len(self)):
+            yield buffer[offsets[i]:offsets[i + 1]]
+
+    def is_bold(self, i: int) -> bool:
+        """Returns whether span i uses a bold font."""
+        return self.font_is_bold[self.font_ids[i]]
+
+    def row(self, i: int) -> Span:
+        """Returns span i as a standalone Span."""
+        return Span(self.text(i), self.font_sizes[i], self.fonts[self.font_ids[i]], self.pages[i])
+
 
 class PDFOutlineExtractor:
     """
@@ -17,7 +294,73 @@ class PDFOutlineExtractor:
     4. Building a nested, hierarchical JSON structure from the identified headings.
     """
 
-    def __init__(self):
+    # Documents shorter than this are never split across page workers; below it the
+    # cost of re-opening the file in every worker outweighs the parallel speedup.
+    MIN_PAGES_PER_WORKER = 32
+
+    # An embedded table of contents needs at least this many usable entries to be trusted
+    MIN_TOC_ENTRIES = 2
+
+    # A sampled body style is trusted only if the sample has at least this many spans and
+    # the most common style leads the best style of another size by this many standard
+    # deviations (sign test); otherwise the remaining pages are counted as well.
+    BODY_SAMPLE_MIN_SPANS = 200
+    BODY_SAMPLE_Z = 3.0
+
+    def __init__(self, page_workers: int = 1, cache: Optional[OutlineCache] = None,
+                 use_embedded_toc: bool = False, streaming: bool = False,
+                 metrics: Optional[NullMetrics] = None, max_heading_levels: Optional[int] = None,
+                 level_size_tolerance: float = 0.0, bold_level_weight: float = 0.0,
+                 input_mode: str = "path", build_tree: bool = True, timeout: Optional[float] = None,
+                 max_pages: Optional[int] = None, max_spans: Optional[int] = None,
+                 body_sample_pages: Optional[int] = None, suppress_repeated_text: bool = False,
+                 repeat_min_pages: int = 3, repeat_min_ratio: float = 0.4, repeat_y_tolerance: float = 5.0):
+        if input_mode not in INPUT_MODES:
+            raise ValueError(f"Unknown input mode: {input_mode!r}")
+        if repeat_y_tolerance <= 0:
+            raise ValueError(f"repeat_y_tolerance must be positive, got {repeat_y_tolerance!r}")
+        # Number of processes used to extract spans from a single document (1 = serial)
+        self.page_workers = page_workers
+        # Optional on-disk cache of finished outlines
+        self.cache = cache
+        # Build the outline from the PDF's bookmarks when present, skipping the layout pass
+        self.use_embedded_toc = use_embedded_toc
+        # Two streaming passes instead of one span table: memory O(headings), not O(spans)
+        self.streaming = streaming
+        # Instrumentation sink for stage timings and counters (disabled by default)
+        self.metrics = metrics or NullMetrics()
+        # Heading level clustering: sizes within level_size_tolerance points share a level,
+        # at most max_heading_levels levels are produced (None = unbounded), and bold
+        # headings rank as if bold_level_weight points larger. The defaults give every
+        # distinct heading size its own level.
+        self.max_heading_levels = max_heading_levels
+        self.level_size_tolerance = level_size_tolerance
+        self.bold_level_weight = bold_level_weight
+        # How files given by path are opened (see INPUT_MODES)
+        self.input_mode = input_mode
+        # False returns {"title", "headings"} with the flat leveled headings instead of the
+        # nested outline, for writers that stream the tree (see round1a_output)
+        self.build_tree = build_tree
+        # Per-document limits (None = unlimited). With a timeout every document runs in
+        # its own child process, which is killed once it exceeds that many seconds.
+        # Documents with more than max_pages pages or max_spans text spans are rejected
+        # with ExtractionLimitExceeded as soon as the budget is known to be exceeded.
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_spans = max_spans
+        # Streaming mode only: estimate the body style from this many pages spread over
+        # the document instead of a full first pass (None = always count every page)
+        self.body_sample_pages = body_sample_pages
+        # Repeated page furniture (running heads, footers, page numbers): spans whose text
+        # (digits ignored), style and y position (in repeat_y_tolerance point bands) recur
+        # on at least repeat_min_pages pages and repeat_min_ratio of the pages scanned are
+        # never classified as headings. Off by default. Since digits are ignored, numbered
+        # labels at a fixed position ("CHAPTER 1", "CHAPTER 2", ... at the top of the page
+        # starting each chapter) count as repeated too.
+        self.suppress_repeated_text = suppress_repeated_text
+        self.repeat_min_pages = repeat_min_pages
+        self.repeat_min_ratio = repeat_min_ratio
+        self.repeat_y_tolerance = repeat_y_tolerance
         # More specific regex patterns to reduce false positives
         self.heading_patterns = [
             r'^(Chapter|Section)\s+\d+[:\.\s].*$',      # "Chapter 1", "Section 2.1"
@@ -33,9 +376,12 @@ class PDFOutlineExtractor:
         if not doc or len(doc) == 0:
             return "Untitled Document"
 
-        first_page = doc[0]
-        # Extract text blocks, sorted by vertical position then horizontal
-        blocks = sorted(first_page.get_text("dict")["blocks"], key=lambda b: (b['bbox'][1], b['bbox'][0]))
+        return self._title_from_blocks(doc[0].get_text("dict", flags=TEXT_ONLY_FLAGS)["blocks"])
+
+    def _title_from_blocks(self, first_page_blocks: List[Dict[str, Any]]) -> str:
+        """Picks the title from the already parsed text blocks of the first page."""
+        # Sort text blocks by vertical position then horizontal
+        blocks = sorted(first_page_blocks, key=lambda b: (b['bbox'][1], b['bbox'][0]))
 
         max_font_size = 0.0
         title_candidates = []
@@ -65,84 +411,278 @@ class PDFOutlineExtractor:
 
         return "Untitled Document"
 
-    def _get_text_spans(self, doc: fitz.Document) -> List[Dict[str, Any]]:
-        """Extracts all text spans from the document with their properties."""
-        spans = []
-        for page_num, page in enumerate(doc):
-            blocks = page.get_text("dict")["blocks"]
-            for block in blocks:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = self._cleanup_text(span["text"])
-                            if text:
-                                spans.append({
-                                    "text": text,
-                                    "font_size": round(span["size"], 2),
-                                    "font": span["font"],
-                                    "is_bold": "bold" in span["font"].lower(),
-                                    "page": page_num + 1,
-                                })
-        return spans
-
-    def _get_body_text_style(self, spans: List[Dict[str, Any]]) -> Tuple[float, str]:
+    def _get_text_spans(self, doc: fitz.Document, pdf_path: Optional[str] = None) -> Tuple[str, SpanTable]:
+        """
+        Extracts the title and all text spans from the document with their properties.
+
+        Every page is parsed exactly once; the title comes from the first page's parse.
+        Page workers re-open the file, so they are only used when its path is known.
+        """
+        if len(doc) == 0:
+            return "Untitled Document", SpanTable()
+        pdf_path = pdf_path or doc.name
+        page_ranges = self._split_page_range(len(doc))
+        if len(page_ranges) > 1 and pdf_path:
+            return self._get_text_spans_parallel(pdf_path, page_ranges)
+        return self._get_page_range_spans(doc, 0, len(doc))
+
+    def _get_page_range_spans(self, doc: fitz.Document, start: int, stop: int) -> Tuple[Optional[str], SpanTable]:
+        """Extracts the text spans of pages [start, stop) in page order, plus the title if page 1 is included."""
+        metrics = self.metrics
+        title = None
+        spans = SpanTable()
+        for page_num in range(start, stop):
+            with metrics.stage("parse"):
+                blocks = doc[page_num].get_text("dict", flags=TEXT_ONLY_FLAGS)["blocks"]
+            if page_num == 0:
+                with metrics.stage("title"):
+                    title = self._title_from_blocks(blocks)
+            with metrics.stage("span_decode"):
+                for text, font_size, font, y in self._iter_block_spans(blocks):
+                    spans.append(text, font_size, font, page_num + 1, y)
+            self._check_span_budget(len(spans))
+        metrics.count("pages", stop - start)
+        metrics.count("spans", len(spans))
+        return title, spans
+
+    def _check_page_budget(self, doc: fitz.Document):
+        if self.max_pages is not None and len(doc) > self.max_pages:
+            raise ExtractionLimitExceeded(f"document has {len(doc)} pages, max_pages is {self.max_pages}")
+
+    def _check_span_budget(self, span_count: int):
+        if self.max_spans is not None and span_count > self.max_spans:
+            raise ExtractionLimitExceeded(f"more than max_spans={self.max_spans} text spans")
+
+    def _iter_block_spans(self, blocks: List[Dict[str, Any]]) -> Iterator[Tuple[str, float, str, float]]:
+        """Yields (text, font_size, font, top y) for every non-empty span of a page's text blocks."""
+        for block in blocks:
+            if "lines" in block:
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        text = self._cleanup_text(span["text"])
+                        if text:
+                            yield text, round(span["size"], 2), span["font"], span["bbox"][1]
+
+    def _iter_pages(self, doc: fitz.Document, page_nums: Optional[Iterable[int]] = None
+                    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yields (page number, text blocks) one page at a time; nothing is kept between pages.
+
+        page_nums restricts the walk to those 0-based page indices.
+        """
+        metrics = self.metrics
+        for page_num in range(len(doc)) if page_nums is None else page_nums:
+            with metrics.stage("parse"):
+                blocks = doc[page_num].get_text("dict", flags=TEXT_ONLY_FLAGS)["blocks"]
+            yield page_num + 1, blocks
+
+    def _split_page_range(self, page_count: int) -> List[Tuple[int, int]]:
+        """Splits [0, page_count) into contiguous slices, one per page worker."""
+        workers = min(_resolve_workers(self.page_workers), page_count // self.MIN_PAGES_PER_WORKER)
+        if workers <= 1:
+            return [(0, page_count)]
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _get_text_spans_parallel(self, pdf_path: str, page_ranges: List[Tuple[int, int]]) -> Tuple[str, SpanTable]:
+        """Extracts each page slice in its own process and merges the slices in page order."""
+        title = None
+        spans = SpanTable()
+        with ProcessPoolExecutor(max_workers=len(page_ranges)) as executor:
+            slices = executor.map(_extract_page_range_spans,
+                                  [self] * len(page_ranges),
+                                  [pdf_path] * len(page_ranges),
+                                  *zip(*page_ranges))
+            for slice_title, slice_spans, slice_metrics in slices:
+                title = title or slice_title
+                spans.extend(slice_spans)
+                self._check_span_budget(len(spans))
+                # Worker timings are summed, i.e. they are CPU-seconds across page workers
+                self.metrics.merge(slice_metrics)
+        return title, spans
+
+    def _get_body_text_style(self, spans: SpanTable) -> Tuple[float, str]:
         """Determines the most common font size and style, presumed to be the body text."""
         if not spans:
             return 12.0, "" # Default values
 
-        font_styles = [(s["font_size"], s["font"]) for s in spans]
-        # Use Counter to find the most common style tuple
-        most_common_style = Counter(font_styles).most_common(1)
+        # Use Counter to find the most common (size, font ID) pair
+        font_size, font_id = self._most_common_style(Counter(zip(spans.font_sizes, spans.font_ids)))
+        return font_size, spans.fonts[font_id] if font_id is not None else ""
+
+    def _most_common_style(self, style_counts: Counter) -> Tuple[float, Any]:
+        """Picks the most frequent (font_size, font) key of a style histogram."""
+        most_common_style = style_counts.most_common(1)
         
         if most_common_style:
             return most_common_style[0][0]
         
-        return 12.0, ""
+        return 12.0, None
+
+    def _find_headings(self, spans: SpanTable, body_font_size: float,
+                       excluded: Optional[List[int]] = None) -> List[int]:
+        """Returns the indices of all spans that look like headings, skipping the excluded ones."""
+        if np is not None:
+            return self._find_headings_vectorized(spans, body_font_size, excluded)
+        is_bold = spans.font_is_bold
+        matcher = self._heading_matcher()
+        excluded = set(excluded or ())
+        return [i for i, (text, font_size, font_id) in enumerate(zip(spans.iter_texts(), spans.font_sizes, spans.font_ids))
+                if i not in excluded and self._is_heading(text, font_size, is_bold[font_id], body_font_size, matcher)]
+
+    def _find_headings_vectorized(self, spans: SpanTable, body_font_size: float,
+                                  excluded: Optional[List[int]] = None) -> List[int]:
+        """
+        Batch version of _is_heading over the whole table.
 
-    def _is_heading(self, span: Dict[str, Any], body_font_size: float) -> bool:
+        The length and style checks are computed as NumPy masks over all spans at once;
+        only the spans passing them get the (much slower) pattern and casing checks.
+        """
+        offsets = np.frombuffer(spans._text_offsets, dtype=np.int64)
+        lengths = np.diff(offsets)
+        font_sizes = np.frombuffer(spans.font_sizes, dtype=np.float64)
+        font_ids = np.frombuffer(spans.font_ids, dtype=np.int32)
+        is_bold = np.array(spans.font_is_bold, dtype=bool)[font_ids]
+
+        is_larger = font_sizes > body_font_size * 1.15
+        mask = (lengths >= 3) & (lengths <= 250) & (is_larger | is_bold)
+        if excluded:
+            mask[np.array(excluded, dtype=np.int64)] = False
+        candidates = np.flatnonzero(mask).tolist()
+
+        texts = spans._texts()
+        bounds = spans._text_offsets
+        matcher = self._heading_matcher()
+        return [i for i in candidates if self._is_heading_text(texts[bounds[i]:bounds[i + 1]], matcher)]
+
+    def register_heading_pattern(self, pattern: str):
+        r"""
+        Adds a regex recognised as heading numbering, e.g. r'^[IVXLC]+\.\s+\S' or
+        r'^Chapitre\s+\d+'. It is matched at the start of the span like the built-in
+        patterns. Patterns are fused into a single regex, so they must not rely on
+        numbered backreferences or on global inline flags (use scoped ones, "(?i:...)").
+
+        Raises re.error if the pattern is invalid, sets global flags, or cannot be
+        fused with the patterns already registered (e.g. a duplicate group name).
+        """
+        if re.compile(pattern).flags & ~re.UNICODE:
+            # A global flag would apply to every fused pattern (or fail to compile)
+            raise re.error("global inline flags are not supported, use a scoped group like (?i:...)", pattern)
+        _compile_heading_patterns(tuple(self.heading_patterns + [pattern]))
+        self.heading_patterns.append(pattern)
+
+    def _heading_matcher(self) -> "re.Pattern[str]":
+        """The fused, compiled form of the current heading_patterns."""
+        return _compile_heading_patterns(tuple(self.heading_patterns))
+
+    def _is_heading(self, text: str, font_size: float, is_bold: bool, body_font_size: float,
+                    matcher: Optional["re.Pattern[str]"] = None) -> bool:
         """Determines if a text span is likely a heading."""
-        text = span["text"]
-        font_size = span["font_size"]
-        is_bold = span["is_bold"]
+        return (self._is_heading_candidate(text, font_size, is_bold, body_font_size)
+                and self._is_heading_text(text, matcher))
 
+    def _is_heading_candidate(self, text: str, font_size: float, is_bold: bool, body_font_size: float) -> bool:
+        """The length and style checks of _is_heading, before any pattern matching."""
         # Basic filtering
         if len(text) < 3 or len(text) > 250:
             return False
-        if text.endswith('.') or text.endswith(':'): # Likely part of a sentence
-            text = text[:-1]
-        
+
         # Style-based checks
         is_larger = font_size > body_font_size * 1.15
-        if is_larger or is_bold:
-            # Check for heading-like patterns
-            for pattern in self.heading_patterns:
-                if re.match(pattern, text):
-                    return True
-            # Title case check (avoid flagging all capitalized words at start of sentence)
-            if text.istitle() and len(text.split()) > 1 and len(text.split()) < 10:
-                return True
-            # All caps check
-            if text.isupper() and len(text.split()) > 1 and len(text.split()) < 10:
-                return True
+        return is_larger or is_bold
+
+    def _is_heading_text(self, text: str, matcher: Optional["re.Pattern[str]"] = None) -> bool:
+        """
+        Pattern and casing checks for a span that already passed the style checks.
+
+        Callers classifying many spans pass the result of _heading_matcher() once.
+        """
+        if matcher is None:
+            matcher = self._heading_matcher()
+        if text.endswith('.') or text.endswith(':'): # Likely part of a sentence
+            text = text[:-1]
+
+        # Check for heading-like patterns
+        if matcher.match(text):
+            return True
+        # Title case or all caps with a few words (avoid flagging all capitalized words
+        # at start of sentence)
+        if text.istitle() or text.isupper():
+            word_count = len(text.split())
+            return 1 < word_count < 10
 
         return False
 
-    def _assign_heading_levels(self, headings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _assign_heading_levels(self, headings: Iterable[Span]) -> List[Span]:
         """Assigns H1, H2, etc., based on font sizes of identified headings."""
+        headings = list(headings)
         if not headings:
             return []
 
-        # Get unique font sizes from headings, sorted in descending order
-        heading_font_sizes = sorted(list(set([h["font_size"] for h in headings])), reverse=True)
-        
-        size_to_level = {size: f"H{i+1}" for i, size in enumerate(heading_font_sizes)}
+        if self.max_heading_levels is None and self.level_size_tolerance <= 0 and not self.bold_level_weight:
+            # Get unique font sizes from headings, sorted in descending order
+            heading_font_sizes = sorted(set(h.font_size for h in headings), reverse=True)
+            
+            size_to_level = {size: f"H{i+1}" for i, size in enumerate(heading_font_sizes)}
+
+            for heading in headings:
+                heading.level = size_to_level.get(heading.font_size, "H9") # Default to a high number
+            
+            return headings
+
+        def rank_size(heading: Span) -> float:
+            return heading.font_size + (self.bold_level_weight if heading.is_bold else 0.0)
+
+        clusters = self._cluster_heading_sizes(sorted(set(rank_size(h) for h in headings), reverse=True))
+        size_to_level = {size: f"H{i+1}" for i, cluster in enumerate(clusters) for size in cluster}
 
         for heading in headings:
-            heading["level"] = size_to_level.get(heading["font_size"], "H9") # Default to a high number
-        
+            heading.level = size_to_level[rank_size(heading)]
+
+        return headings
+
+    def _cluster_heading_sizes(self, sizes: List[float]) -> List[List[float]]:
+        """
+        Groups distinct heading sizes (sorted descending) into levels.
+
+        Gap-based 1-D clustering: neighbouring sizes at most level_size_tolerance apart
+        share a cluster; then, while there are more than max_heading_levels clusters,
+        the two adjacent clusters separated by the smallest gap are merged.
+        """
+        clusters = [[sizes[0]]]
+        for size in sizes[1:]:
+            if clusters[-1][-1] - size <= self.level_size_tolerance:
+                clusters[-1].append(size)
+            else:
+                clusters.append([size])
+
+        max_levels = max(self.max_heading_levels or len(clusters), 1)
+        while len(clusters) > max_levels:
+            gaps = [upper[-1] - lower[0] for upper, lower in zip(clusters, clusters[1:])]
+            i = gaps.index(min(gaps))
+            clusters[i:i + 2] = [clusters[i] + clusters[i + 1]]
+        return clusters
+
+    def _headings_from_toc(self, doc: fitz.Document) -> List[Span]:
+        """
+        Converts the PDF's embedded table of contents (bookmarks) into leveled headings.
+
+        Returns an empty list when the document has no usable outline, so the caller can
+        fall back to the font-based heuristics.
+        """
+        headings = []
+        for level, text, page in doc.get_toc(simple=True):
+            text = self._cleanup_text(text)
+            # Bookmarks without text or pointing outside the document are skipped
+            if text and 1 <= page <= len(doc):
+                # Already leveled; bookmarks carry no font
+                headings.append(Span(text, 0.0, "", page, level=f"H{level}"))
+
+        if len(headings) < self.MIN_TOC_ENTRIES:
+            return []
         return headings
 
-    def _build_hierarchical_outline(self, headings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _build_hierarchical_outline(self, headings: List[Span]) -> List[Dict[str, Any]]:
         """Builds a nested dictionary structure from a flat list of headings."""
         if not headings:
             return []
@@ -152,7 +692,7 @@ class PDFOutlineExtractor:
         path = []
 
         for heading in headings:
-            level_num = int(heading["level"][1:])
+            level_num = int(heading.level[1:])
             
             # Go back up the hierarchy to the correct parent level
             while len(path) >= level_num:
@@ -160,9 +700,9 @@ class PDFOutlineExtractor:
 
             # Prepare the new heading node
             heading_node = {
-                "level": heading["level"],
-                "text": heading["text"],
-                "page": heading["page"],
+                "level": heading.level,
+                "text": heading.text,
+                "page": heading.page,
                 "children": []
             }
 
@@ -179,64 +719,805 @@ class PDFOutlineExtractor:
         
         return outline
 
-    def extract_outline(self, pdf_path: str) -> Dict[str, Any]:
-        """Main function to extract a structured, hierarchical outline from a PDF."""
-        try:
-            doc = fitz.open(pdf_path)
-            
-            # 1. Extract title
-            title = self.extract_title(doc)
-            
-            # 2. Get all text spans
-            all_spans = self._get_text_spans(doc)
-            if not all_spans:
-                doc.close()
-                return {"title": title, "outline": []}
-            
-            # 3. Determine body text style to use as a baseline
+    def _outline_result(self, title: str, headings: List[Span]) -> Dict[str, Any]:
+        """Packages leveled headings as the nested outline, or flat when build_tree is off."""
+        if self.build_tree:
+            return {"title": title, "outline": self._build_hierarchical_outline(headings)}
+        return {"title": title,
+                "headings": [{"level": h.level, "text": h.text, "page": h.page} for h in headings]}
+
+    def _cache_config(self) -> Dict[str, Any]:
+        """Settings that affect the extracted outline; part of every cache key."""
+        return {
+            "version": EXTRACTOR_VERSION,
+            "heading_patterns": list(self.heading_patterns),
+            "use_embedded_toc": self.use_embedded_toc,
+            # Streaming only approximates repeated-text detection (see _count_page_styles)
+            "streaming": self.streaming,
+            "max_heading_levels": self.max_heading_levels,
+            "level_size_tolerance": self.level_size_tolerance,
+            "bold_level_weight": self.bold_level_weight,
+            "build_tree": self.build_tree,
+            # Only the streaming pipeline samples pages
+            "body_sample_pages": self.body_sample_pages if self.streaming else None,
+            "suppress_repeated_text": self.suppress_repeated_text,
+            "repeat_min_pages": self.repeat_min_pages,
+            "repeat_min_ratio": self.repeat_min_ratio,
+            "repeat_y_tolerance": self.repeat_y_tolerance,
+        }
+
+    @contextmanager
+    def _open_document(self, source: PDFSource) -> Iterator[fitz.Document]:
+        """
+        Opens a PDF from a path (according to input_mode), or from its bytes without
+        touching the disk, and closes it (and any file mapping) afterwards.
+        """
+        source = _normalize_source(source)
+        if isinstance(source, (bytes, bytearray)):
+            with fitz.open(stream=source, filetype="pdf") as doc:
+                yield doc
+        elif self.input_mode == "bytes":
+            with open(source, "rb") as f:
+                data = f.read()
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                yield doc
+        elif self.input_mode == "mmap" and _FITZ_OPENS_BUFFERS:
+            with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                doc = fitz.open(stream=view, filetype="pdf")
+                try:
+                    with doc:
+                        yield doc
+                finally:
+                    del doc
+                    view.release()
+        else:
+            with fitz.open(source) as doc:
+                yield doc
+
+    def _extract_outline(self, source: PDFSource) -> Dict[str, Any]:
+        """Runs the extraction pipeline on one PDF; errors propagate to the caller."""
+        metrics = self.metrics
+        pdf_path = source if isinstance(source, str) else None
+        with ExitStack() as stack:
+            with metrics.stage("open"):
+                doc = stack.enter_context(self._open_document(source))
+            self._check_page_budget(doc)
+            # Fast path: a usable embedded outline replaces the heuristics entirely
+            if self.use_embedded_toc:
+                with metrics.stage("toc"):
+                    toc_headings = self._headings_from_toc(doc)
+                if toc_headings:
+                    metrics.count("headings", len(toc_headings))
+                    with metrics.stage("title"):
+                        title = self.extract_title(doc)
+                    with metrics.stage("tree"):
+                        return self._outline_result(title, toc_headings)
+
+            if self.streaming:
+                return self._extract_outline_streaming(doc)
+
+            # 1-2. Get all text spans, and the title from the first page's spans
+            title, all_spans = self._get_text_spans(doc, pdf_path)
+            page_count = len(doc)
+        if not all_spans:
+            return self._outline_result(title, [])
+        
+        # 3. Determine body text style to use as a baseline
+        with metrics.stage("body_style"):
             body_font_size, _ = self._get_body_text_style(all_spans)
 
-            # 4. Identify all potential headings
-            headings = [span for span in all_spans if self._is_heading(span, body_font_size)]
+        # 4. Identify all potential headings, ignoring repeated page furniture
+        excluded = None
+        if self.suppress_repeated_text:
+            with metrics.stage("repeat_detection"):
+                excluded = self._find_repeated_spans(all_spans, page_count)
+            metrics.count("repeated_spans", len(excluded))
+        with metrics.stage("classification"):
+            heading_indices = self._find_headings(all_spans, body_font_size, excluded)
+        metrics.count("headings", len(heading_indices))
 
-            # 5. Assign levels (H1, H2, ...) to headings
-            leveled_headings = self._assign_heading_levels(headings)
-            
-            # 6. Build the final hierarchical structure
-            hierarchical_outline = self._build_hierarchical_outline(leveled_headings)
+        # 5. Assign levels (H1, H2, ...) to headings
+        with metrics.stage("leveling"):
+            leveled_headings = self._assign_heading_levels(all_spans.row(i) for i in heading_indices)
+        
+        # 6. Build the final hierarchical structure
+        with metrics.stage("tree"):
+            return self._outline_result(title, leveled_headings)
 
-            doc.close()
-            
-            return {"title": title, "outline": hierarchical_outline}
+    def _extract_outline_streaming(self, doc: fitz.Document) -> Dict[str, Any]:
+        """
+        Bounded-memory variant of the pipeline that never holds all spans at once.
+
+        The first pass over the pages only accumulates the (font_size, font) histogram
+        that determines the body style; the second pass streams heading candidates
+        straight into leveling and tree building. With body_sample_pages the first pass
+        covers only a page sample, and is redone over all pages if the sample is
+        inconclusive.
+        Instrumentation is coarser here: the second pass is reported as one stage, which
+        overlaps its "parse" time.
+        """
+        metrics = self.metrics
+        title = "Untitled Document"
+        style_counts = None
+        if self.body_sample_pages and len(doc) > self.body_sample_pages:
+            # Pass 1 over a stratified page sample only; a conclusive sample skips the full pass
+            sample = self._sample_page_nums(len(doc))
+            style_counts = Counter()
+            repeat_pages = Counter() if self.suppress_repeated_text else None
+            sample_title = self._count_page_styles(doc, sample, style_counts, repeat_pages)
+            pages_scanned = len(sample)
+            metrics.count("sampled_pages", len(sample))
+            if self._is_conclusive_sample(style_counts):
+                if sample_title is None:
+                    with metrics.stage("title"):
+                        sample_title = self.extract_title(doc)
+                title = sample_title
+            else:
+                # Recount from scratch, so ties are broken in page order exactly like a full pass
+                metrics.count("sample_fallbacks")
+                style_counts = None
+
+        # Pass 1: title and style histogram
+        if style_counts is None:
+            style_counts = Counter()
+            repeat_pages = Counter() if self.suppress_repeated_text else None
+            title = self._count_page_styles(doc, None, style_counts, repeat_pages) or title
+            pages_scanned = len(doc)
+        metrics.count("pages", len(doc))
+        metrics.count("spans", sum(style_counts.values()))
+        if not style_counts:
+            return self._outline_result(title, [])
+        with metrics.stage("body_style"):
+            body_font_size, _ = self._most_common_style(style_counts)
+
+        # Pass 2: heading candidates only
+        with metrics.stage("classification_and_leveling"):
+            repeated_keys = self._repeated_keys(repeat_pages, pages_scanned) if repeat_pages else None
+            leveled_headings = self._assign_heading_levels(self._iter_headings(doc, body_font_size, repeated_keys))
+        metrics.count("headings", len(leveled_headings))
+        with metrics.stage("tree"):
+            return self._outline_result(title, leveled_headings)
+
+    def _count_page_styles(self, doc: fitz.Document, page_nums: Optional[Iterable[int]],
+                           style_counts: Counter, repeat_pages: Optional[Counter] = None) -> Optional[str]:
+        """
+        Adds the (font_size, font) of every span on the given pages (None = all) to
+        style_counts, and if repeat_pages is given, counts the pages each repeat key
+        occurs on. Returns the title if the first page was among them.
+
+        Only spans that could become headings are suppressed later, so repeat keys are
+        kept only for heading candidates, judged against the body size of the pages
+        counted so far. This keeps repeat_pages far smaller than the number of distinct
+        spans; a candidate on an early page can be missed while the provisional body
+        size is still larger than the final one.
+        """
+        metrics = self.metrics
+        title = None
+        for page, blocks in self._iter_pages(doc, page_nums):
+            if page == 1:
+                with metrics.stage("title"):
+                    title = self._title_from_blocks(blocks)
+            with metrics.stage("span_decode"):
+                if repeat_pages is None:
+                    style_counts.update((font_size, font) for _, font_size, font, _ in self._iter_block_spans(blocks))
+                else:
+                    page_spans = []
+                    for text, font_size, font, y in self._iter_block_spans(blocks):
+                        style_counts[font_size, font] += 1
+                        page_spans.append((text, font_size, font, y))
+                    body_font_size, _ = self._most_common_style(style_counts)
+                    repeat_pages.update({
+                        self._repeat_key(text, font_size, font, y) for text, font_size, font, y in page_spans
+                        if self._is_heading_candidate(text, font_size, _font_flags(font)[0], body_font_size)
+                    })
+            if self.max_spans is not None:
+                self._check_span_budget(sum(style_counts.values()))
+        return title
+
+    def _repeat_key(self, text: str, font_size: float, font: str, y: float) -> RepeatKey:
+        """Identity of a span for repeated-text detection: same text modulo digits, style and position band."""
+        return _DIGIT_RUNS.sub("#", text).lower(), round(y / self.repeat_y_tolerance), font_size, font
+
+    def _repeat_threshold(self, pages_scanned: int) -> int:
+        """Minimum number of pages a repeat key must occur on to count as page furniture."""
+        return max(self.repeat_min_pages, math.ceil(self.repeat_min_ratio * pages_scanned))
+
+    def _repeated_keys(self, repeat_pages: Counter, pages_scanned: int) -> Set[RepeatKey]:
+        """Repeat keys occurring on enough of the scanned pages to be page furniture."""
+        threshold = self._repeat_threshold(pages_scanned)
+        return {key for key, pages in repeat_pages.items() if pages >= threshold}
+
+    def _find_repeated_spans(self, spans: SpanTable, page_count: int) -> List[int]:
+        """
+        Returns the indices of spans that are repeated page furniture.
+
+        One pass assigns every span a repeat key ID and counts the distinct pages per
+        key (spans are in page order, so a key's page count grows when its last page
+        changes); a second pass over the key IDs selects the repeated spans.
+        """
+        key_ids: Dict[RepeatKey, int] = {}
+        key_pages: List[int] = []
+        key_last_page: List[int] = []
+        span_keys = array('i')
+        fonts = spans.fonts
+        for text, font_size, font_id, page, y in zip(spans.iter_texts(), spans.font_sizes, spans.font_ids,
+                                                     spans.pages, spans.y_positions):
+            key_id = key_ids.setdefault(self._repeat_key(text, font_size, fonts[font_id], y), len(key_ids))
+            if key_id == len(key_pages):
+                key_pages.append(0)
+                key_last_page.append(0)
+            if key_last_page[key_id] != page:
+                key_last_page[key_id] = page
+                key_pages[key_id] += 1
+            span_keys.append(key_id)
+
+        threshold = self._repeat_threshold(page_count)
+        return [i for i, key_id in enumerate(span_keys) if key_pages[key_id] >= threshold]
+
+    def _sample_page_nums(self, page_count: int) -> List[int]:
+        """Picks the middle page of each of body_sample_pages equal slices of the document."""
+        bounds = [page_count * i // self.body_sample_pages for i in range(self.body_sample_pages + 1)]
+        return [(start + stop) // 2 for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def _is_conclusive_sample(self, style_counts: Counter) -> bool:
+        """
+        True if a sampled style histogram is large and one-sided enough that counting
+        every page would pick the same body font size.
+        """
+        total = sum(style_counts.values())
+        if total < self.BODY_SAMPLE_MIN_SPANS:
+            return False
+        ranked = style_counts.most_common()
+        (top_size, _), top_count = ranked[0]
+        # Styles sharing the top size cannot change the body size, whichever wins
+        runner_up = next((count for (font_size, _), count in ranked[1:] if font_size != top_size), 0)
+        return top_count - runner_up >= self.BODY_SAMPLE_Z * math.sqrt(top_count + runner_up)
+
+    def _iter_headings(self, doc: fitz.Document, body_font_size: float,
+                       repeated_keys: Optional[Set[RepeatKey]] = None) -> Iterator[Span]:
+        """
+        Streams the spans of every page and yields those classified as headings, skipping
+        spans matching repeated_keys.
+        """
+        span_count = 0
+        matcher = self._heading_matcher()
+        for page, blocks in self._iter_pages(doc):
+            for text, font_size, font, y in self._iter_block_spans(blocks):
+                span_count += 1
+                if repeated_keys and self._repeat_key(text, font_size, font, y) in repeated_keys:
+                    continue
+                is_bold, _ = _font_flags(font)
+                if self._is_heading(text, font_size, is_bold, body_font_size, matcher):
+                    yield Span(text, font_size, font, page)
+            # Pass 1 may have seen only a sample of the pages
+            self._check_span_budget(span_count)
+
+    def _extract_outline_cached(self, source: PDFSource) -> Dict[str, Any]:
+        """
+        Serves the outline from the cache if possible; extraction errors propagate to
+        the caller. Cache I/O errors are only logged: the cache never changes the result.
+        """
+        if self.cache is None:
+            return self._extract_outline(source)
+
+        with self.metrics.stage("cache"):
+            try:
+                cache_key = self.cache.key(source, self._cache_config())
+                outline_data = self.cache.get(cache_key)
+            except OSError as e:
+                print(f"Cache unavailable for {_source_label(source)}: {e}")
+                cache_key = outline_data = None
+        if outline_data is not None:
+            self.metrics.count("cache_hits")
+            return outline_data
+        self.metrics.count("cache_misses")
+        outline_data = self._extract_outline(source)
+        if cache_key is not None:
+            with self.metrics.stage("cache"):
+                try:
+                    self.cache.put(cache_key, outline_data)
+                except OSError as e:
+                    print(f"Could not cache the outline of {_source_label(source)}: {e}")
+                    self.metrics.count("cache_write_errors")
+        return outline_data
+
+    def extract_outline(self, pdf_path: PDFSource) -> Dict[str, Any]:
+        """
+        Main function to extract a structured, hierarchical outline from a PDF.
+
+        Besides a path, pdf_path may be the PDF's bytes, a memoryview of them or a
+        binary file-like object (e.g. an HTTP upload), which is parsed in memory.
+        With a timeout the document is extracted in a child process (see __init__).
+        """
+        if self.timeout is not None:
+            return _extract_isolated(self, _normalize_source(pdf_path)).outline
+        try:
+            return self._extract_outline_cached(_normalize_source(pdf_path))
         
         except Exception as e:
-            print(f"Error processing {pdf_path}: {e}")
-            return {"title": "Error Processing Document", "outline": []}
+            print(f"Error processing {_source_label(pdf_path)}: {e}")
+            return _error_outline()
+
+    def create_pool(self, workers: int = 0) -> "ExtractorPool":
+        """
+        Creates a process pool whose workers each hold a copy of this extractor.
+
+        The pool can be passed to extract_many(executor=...) of this extractor
+        repeatedly to share its warm workers across calls; the workers keep the
+        settings this extractor had when the pool was created. The caller is
+        responsible for shutting it down.
+        """
+        return ExtractorPool(self, _resolve_workers(workers))
+
+    def extract_many(self, sources: Iterable[PDFSource], workers: int = 1, ordered: bool = True,
+                     chunksize: int = 1, executor: Optional[Executor] = None
+                     ) -> Iterator[Tuple[PDFSource, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Extracts outlines for many PDFs, yielding (source, result, error).
+
+        Sources can be anything extract_outline accepts and are yielded back as given.
+
+        result is None and error a message when a document fails (including sources
+        that cannot be read). With workers > 1 (0 = one per CPU) documents run on a
+        process pool, or on `executor` when one is given: a pool from this extractor's
+        create_pool reuses its warm workers, any other executor (e.g. a
+        ThreadPoolExecutor) runs tasks carrying this extractor; pass its size as
+        workers, which bounds the documents queued on it.
+        ordered=False yields documents as they complete.
+        chunksize groups that many documents per pool task to amortise IPC overhead.
+        With a timeout and no executor, each document runs in its own child process
+        instead, supervised by a thread per worker.
+
+        With instrumentation enabled, every document's metrics are added to this
+        extractor's sink.
+        """
+        for source, result in self._iter_results(sources, workers, ordered, chunksize, executor):
+            if result.metrics is not None:
+                self.metrics.merge(result.metrics)
+            yield source, None if result.error else result.outline, result.error
+
+    def _iter_results(self, sources: Iterable[PDFSource], workers: int = 1, ordered: bool = True,
+                      chunksize: int = 1, executor: Optional[Executor] = None
+                      ) -> Iterator[Tuple[PDFSource, "DocumentResult"]]:
+        """Core of extract_many, yielding full DocumentResults."""
+        workers = _resolve_workers(workers)
+        if executor is None and workers == 1:
+            extract = _extract_isolated if self.timeout is not None else _extract_document
+            # _extract_document gives every document a fresh metrics sink; keep ours intact
+            extractor = copy.copy(self)
+            for source in sources:
+                try:
+                    normalized = _normalize_source(source)
+                except Exception as e:
+                    yield source, _unreadable_source_result(source, e)
+                    continue
+                yield source, extract(extractor, normalized)
+            return
+
+        own_executor = executor is None
+        task = _extract_chunk_in_worker
+        if isinstance(executor, ExtractorPool) and executor.extractor is self:
+            workers = executor.workers
+        elif not own_executor:
+            # Not one of our pools: its workers have no (or another) extractor installed
+            task = partial(_extract_chunk_isolated if self.timeout is not None else _extract_chunk, self)
+        elif self.timeout is not None:
+            # Threads only supervise; the extraction runs in killable child processes
+            executor = ThreadPoolExecutor(max_workers=workers)
+            task = partial(_extract_chunk_isolated, self)
+        else:
+            executor = self.create_pool(workers)
+        try:
+            # Bound the work in flight so huge (or endless) source iterables are consumed lazily
+            max_in_flight = 2 * workers
+            yield from _iter_pool_results(executor, _chunked(sources, chunksize), max_in_flight, ordered, task)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+
+def _normalize_source(source: PDFSource) -> Union[str, bytes, bytearray]:
+    """
+    Reduces a PDF source to a path string or a bytes-like object fitz can open.
+
+    Avoids copies where possible: a memoryview spanning a whole bytes object is
+    unwrapped to that object, and BytesIO.getvalue() shares the buffer.
+    """
+    if isinstance(source, (str, bytes, bytearray)):
+        return source
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    if isinstance(source, memoryview):
+        if isinstance(source.obj, bytes) and source.contiguous and source.nbytes == len(source.obj):
+            return source.obj
+        return source.tobytes()
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        return source.read()
+    raise TypeError(f"Unsupported PDF source: {type(source).__name__}")
+
+
+def _source_label(source: PDFSource) -> str:
+    """Human-readable name of a PDF source for log messages."""
+    if isinstance(source, (str, os.PathLike)):
+        return str(source)
+    return f"<in-memory {type(source).__name__}>"
+
+
+def _error_outline() -> Dict[str, Any]:
+    """The outline written for documents that could not be processed."""
+    return {"title": "Error Processing Document", "outline": []}
+
+
+class DocumentResult(NamedTuple):
+    """Outcome of processing one document in a batch."""
+    outline: Dict[str, Any]
+    error: Optional[str]
+    seconds: float
+    metrics: Optional[Dict[str, Dict[str, float]]]
+
+
+def _unreadable_source_result(source: PDFSource, error: Exception) -> DocumentResult:
+    """The result of a batch source that could not even be turned into a path or bytes."""
+    print(f"Error processing {_source_label(source)}: {error}")
+    return DocumentResult(_error_outline(), f"{type(error).__name__}: {error}", 0.0, None)
+
+
+class ExtractorPool(ProcessPoolExecutor):
+    """
+    Process pool made by PDFOutlineExtractor.create_pool, whose `workers` processes
+    each hold a copy of `extractor` (installed once by _init_worker).
+    """
+
+    def __init__(self, extractor: PDFOutlineExtractor, workers: int):
+        super().__init__(max_workers=workers, initializer=_init_worker, initargs=(extractor,))
+        self.extractor = extractor
+        self.workers = workers
+
+
+# Per-process extractor used by pool workers; set up once by _init_worker so each
+# worker keeps its own PDFOutlineExtractor (and fitz state) for every document it handles.
+_worker_extractor = None
+
+
+def _init_worker(extractor: PDFOutlineExtractor):
+    """Pool initializer: installs this worker's private extractor."""
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_in_worker(source: PDFSource) -> DocumentResult:
+    """Runs extract_outline with the worker's extractor."""
+    return _extract_document(_worker_extractor, source)
+
 
+def _extract_chunk_in_worker(sources: List[PDFSource]) -> List[DocumentResult]:
+    """Runs a chunk of documents in one pool task."""
+    return [_extract_document(_worker_extractor, source) for source in sources]
 
-def process_pdfs(input_dir: str, output_dir: str):
-    """Processes all PDFs in an input directory and saves their outlines to an output directory."""
-    extractor = PDFOutlineExtractor()
+
+def _extract_chunk(extractor: PDFOutlineExtractor, sources: List[PDFSource]) -> List[DocumentResult]:
+    """Runs a chunk of documents with the given extractor, on an executor not made by create_pool."""
+    # Thread pool tasks share the extractor; a shallow copy keeps their metrics sinks apart
+    extractor = copy.copy(extractor)
+    return [_extract_document(extractor, source) for source in sources]
+
+
+def _chunked(sources: Iterable[PDFSource], chunksize: int) -> Iterator[List[PDFSource]]:
+    chunk = []
+    for source in sources:
+        chunk.append(source)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_pool_results(executor: Executor, chunks: Iterator[List[PDFSource]], max_in_flight: int,
+                       ordered: bool, task=_extract_chunk_in_worker) -> Iterator[Tuple[PDFSource, DocumentResult]]:
+    """
+    Submits chunks lazily, keeping at most max_in_flight running, and yields their
+    results paired with the sources as given. Tasks receive the sources normalized;
+    a source that cannot be normalized gets its error result without being submitted.
+    """
+    in_flight = deque()
+    chunks = iter(chunks)
+    exhausted = False
+
+    while True:
+        while not exhausted and len(in_flight) < max_in_flight:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                continue
+            normalized, failed = [], {}
+            for i, source in enumerate(chunk):
+                try:
+                    normalized.append(_normalize_source(source))
+                except Exception as e:
+                    failed[i] = _unreadable_source_result(source, e)
+            if normalized:
+                future = executor.submit(task, normalized)
+            else:
+                future = Future()
+                future.set_result([])
+            in_flight.append((chunk, failed, future))
+        if not in_flight:
+            return
+
+        if ordered:
+            done = [in_flight.popleft()]
+        else:
+            finished, _ = wait([future for _, _, future in in_flight], return_when=FIRST_COMPLETED)
+            done = [item for item in in_flight if item[2] in finished]
+            for item in done:
+                in_flight.remove(item)
+
+        for chunk, failed, future in done:
+            results = iter(future.result())
+            for i, source in enumerate(chunk):
+                yield source, failed[i] if i in failed else next(results)
+
+
+def _extract_document(extractor: PDFOutlineExtractor, source: PDFSource) -> DocumentResult:
+    """
+    Extracts one outline like extract_outline, but also reports the error (if any),
+    the elapsed time and that document's metrics when instrumentation is enabled.
+    """
+    if extractor.metrics.enabled:
+        extractor.metrics = type(extractor.metrics)()
+    start = time.perf_counter()
+    error = None
+    try:
+        outline_data = extractor._extract_outline_cached(source)
+    except Exception as e:
+        print(f"Error processing {_source_label(source)}: {e}")
+        outline_data = _error_outline()
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+    doc_metrics = extractor.metrics.as_dict() if extractor.metrics.enabled else None
+    return DocumentResult(outline_data, error, seconds, doc_metrics)
+
+
+@lru_cache(maxsize=None)
+def _isolation_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for isolated children. They are started from supervisor threads, and
+    forking a multi-threaded process can hand the child a lock another thread holds
+    (e.g. the stdout buffer's), deadlocking it; so they are forked from a single-threaded
+    fork server with this module preloaded, or spawned where there is none.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _start_isolation_server():
+    """Starts the fork server for isolated children now rather than on the first document."""
+    if _isolation_context().get_start_method() == "forkserver":
+        multiprocessing.forkserver.ensure_running()
+
+
+def _extract_isolated(extractor: PDFOutlineExtractor, source: PDFSource) -> DocumentResult:
+    """
+    Runs _extract_document in a child process, killing it (and any page workers it
+    started) once it exceeds extractor.timeout seconds.
+
+    A timed-out or crashed child yields the error outline with a TimeoutError or
+    WorkerCrashed error instead of blocking the caller.
+    """
+    context = _isolation_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_isolated_child, args=(extractor, source, sender))
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+    result = None
+    finished = False
+    try:
+        finished = receiver.poll(extractor.timeout)
+        if finished:
+            result = receiver.recv()
+    except EOFError:
+        pass  # the child died before sending a result
+    finally:
+        if result is None:
+            _kill_process_group(process)
+        process.join()
+        receiver.close()
+    if result is not None:
+        return result
+
+    if finished:
+        error = f"WorkerCrashed: extraction process exited with code {process.exitcode}"
+    else:
+        error = f"TimeoutError: extraction exceeded {extractor.timeout:g}s"
+    print(f"Error processing {_source_label(source)}: {error}")
+    return DocumentResult(_error_outline(), error, time.perf_counter() - start, None)
+
+
+def _extract_chunk_isolated(extractor: PDFOutlineExtractor, sources: List[PDFSource]) -> List[DocumentResult]:
+    """Runs a chunk of documents one after another, each in its own child process."""
+    return [_extract_isolated(extractor, source) for source in sources]
+
+
+def _run_isolated_child(extractor: PDFOutlineExtractor, source: PDFSource, sender):
+    """Child side of _extract_isolated."""
+    # Lead a new process group so a timeout also takes down page worker grandchildren
+    try:
+        os.setpgid(0, 0)
+    except (AttributeError, OSError):
+        pass
+    sender.send(_extract_document(extractor, source))
+    sender.close()
+
+
+def _kill_process_group(process: multiprocessing.Process):
+    """Kills an isolated child and its process group, if it got to create one."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        process.kill()
+
+
+def _iter_serial(extractor: PDFOutlineExtractor, pdf_files: List[Path]):
+    """Extracts documents one after another in this process (or in isolated children with a timeout)."""
+    extract = _extract_isolated if extractor.timeout is not None else _extract_document
+    for pdf_file in pdf_files:
+        print(f"Processing {pdf_file.name}...")
+        yield extract(extractor, str(pdf_file))
+
+
+def _extract_page_range_spans(extractor: PDFOutlineExtractor, pdf_path: str, start: int,
+                              stop: int) -> Tuple[Optional[str], SpanTable, Dict[str, Dict[str, float]]]:
+    """Page worker: opens the PDF independently and extracts spans for one page slice."""
+    # Record into a fresh sink of the same kind; the parent merges the snapshot
+    extractor.metrics = type(extractor.metrics)()
+    with fitz.open(pdf_path) as doc:
+        title, spans = extractor._get_page_range_spans(doc, start, stop)
+    return title, spans, extractor.metrics.as_dict()
+
+
+def _resolve_workers(workers: int) -> int:
+    """Maps a worker count of 0 (or less) to the number of available CPUs."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def process_pdfs(input_dir: str, output_dir: str, extractor: Optional[PDFOutlineExtractor] = None,
+                 workers: int = 1, metrics: Optional[str] = None, manifest: Optional[str] = None,
+                 output_format: str = "pretty", results: Optional[str] = None,
+                 results_max_bytes: Optional[int] = None, results_gzip: bool = False):
+    """
+    Processes all PDFs in an input directory and saves their outlines to an output directory.
+
+    extractor carries every extraction setting (a default PDFOutlineExtractor if None).
+    With build_tree=False the outlines are written node by node from the flat headings
+    instead of building the nested tree. Timeouts and page/span budgets are the
+    extractor's too; a document exceeding them gets the error outline and is recorded
+    as failed.
+
+    With workers > 1 the documents are fanned out over a process pool of that size
+    (0 means one worker per CPU); output files are identical to a serial run.
+    output_format is "pretty" (indented) or "compact" JSON.
+
+    results names a single NDJSON stream ("-" for stdout) that receives one line per
+    document (path, title, outline, seconds, stage timings, error) instead of the
+    per-file outlines; it can be gzip-compressed (results_gzip) and split into parts
+    of about results_max_bytes each (see ResultStreamWriter).
+
+    metrics enables instrumentation: "sidecar" writes <stem>.metrics.json next to each
+    outline, "summary" writes one aggregated run_metrics.json for the whole run.
+
+    manifest names a checkpoint file recording every finished input; a restarted run
+    skips inputs that completed successfully and are unchanged, and retries the rest.
+    """
+    extractor = extractor or PDFOutlineExtractor()
+    if metrics not in (None, "sidecar", "summary"):
+        raise ValueError(f"Unknown metrics mode: {metrics!r}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    if results and not extractor.build_tree:
+        raise ValueError("build_tree=False applies to per-file outlines, not to a results stream")
+    if manifest and results and results != "-" and results_gzip and results_max_bytes is None:
+        # A crash leaves the gzip member open; appending to it would corrupt the stream
+        raise ValueError("a resumable gzip results stream needs rotation (results_max_bytes)")
+    if metrics and not extractor.metrics.enabled:
+        # Instrument a copy; the caller's extractor keeps its own sink
+        extractor = copy.copy(extractor)
+        extractor.metrics = ExtractionMetrics()
     
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
+
+    with ExitStack() as stack:
+        if results == "-":
+            # stdout carries the result stream; progress messages go to stderr instead
+            stack.enter_context(redirect_stdout(sys.stderr))
+        writer = stack.enter_context(ResultStreamWriter(results, results_max_bytes, results_gzip)) if results else None
+
+        pdf_files = list(input_path.glob("*.pdf"))
+        checkpoint = stack.enter_context(CheckpointManifest(manifest)) if manifest else None
+        if checkpoint:
+            remaining = [f for f in pdf_files
+                         if not checkpoint.is_complete(f, None if writer else output_path / f"{f.stem}.json")]
+            if len(remaining) < len(pdf_files):
+                print(f"Skipping {len(pdf_files) - len(remaining)} PDF(s) already completed in {manifest}")
+            pdf_files = remaining
+        workers = min(_resolve_workers(workers), max(len(pdf_files), 1))
+        run_metrics = ExtractionMetrics()
+        run_start = time.perf_counter()
+
+        if workers > 1:
+            doc_results = (result for _, result in extractor._iter_results([str(f) for f in pdf_files], workers))
+        else:
+            doc_results = _iter_serial(extractor, pdf_files)
+
+        for pdf_file, result in zip(pdf_files, doc_results):
+            if workers > 1:
+                print(f"Processed {pdf_file.name}")
+            if result.metrics is None:
+                _save_result(output_path, pdf_file, result, output_format, writer)
+            else:
+                file_metrics = ExtractionMetrics()
+                file_metrics.merge(result.metrics)
+                with file_metrics.stage("write"):
+                    _save_result(output_path, pdf_file, result, output_format, writer)
+                if metrics == "sidecar":
+                    _write_json(output_path / f"{pdf_file.stem}.metrics.json", file_metrics.as_dict())
+                run_metrics.merge(file_metrics.as_dict())
+                run_metrics.count("documents")
+            # Checkpoint only after the output is written and handed to the OS
+            if checkpoint:
+                if writer is not None:
+                    writer.flush(fsync=checkpoint.fsync)
+                checkpoint.record(pdf_file, "error" if result.error else "ok", result.seconds, result.error)
+
+    if metrics == "summary":
+        summary = {"wall_seconds": time.perf_counter() - run_start, "workers": workers, **run_metrics.as_dict()}
+        _write_json(output_path / "run_metrics.json", summary)
+
+
+def _save_result(output_path: Path, pdf_file: Path, result: DocumentResult, output_format: str,
+                 writer: Optional[ResultStreamWriter]):
+    """Writes one document's outline file, or its line of the result stream."""
+    if writer is None:
+        save_outline(output_path, pdf_file, result.outline, output_format)
+        return
+    writer.write({
+        "path": str(pdf_file),
+        "title": result.outline["title"],
+        "outline": result.outline["outline"],
+        "seconds": round(result.seconds, 6),
+        "timings": result.metrics["timings"] if result.metrics else None,
+        "error": result.error,
+    })
+
+
+def save_outline(output_path: Path, pdf_file: Path, outline_data: Dict[str, Any],
+                  output_format: str = "pretty"):
+    """Writes one document's outline (nested or flat) as <stem>.json in the output directory."""
+    output_file = output_path / f"{pdf_file.stem}.json"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        write_outline(f, outline_data, output_format)
     
-    for pdf_file in input_path.glob("*.pdf"):
-        print(f"Processing {pdf_file.name}...")
-        
-        outline_data = extractor.extract_outline(str(pdf_file))
-        
-        output_file = output_path / f"{pdf_file.stem}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(outline_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Saved outline to {output_file}")
+    print(f"Saved outline to {output_file}")
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    """Writes a small JSON document such as a metrics file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
 
 
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) != 3:
         print("Usage: python your_script_name.py <input_dir> <output_dir>")
         sys.exit(1)
@@ -0,0 +1,252 @@
+"""
+Serialisation of outline JSON files.
+
+Outlines are written either "pretty" (json.dump with indent=2, the historical
+format) or "compact" (no whitespace). orjson is used when installed; it produces
+the same bytes as the json module for outlines, only faster. Floats, which only
+occur in result stream records (timings), may be spelled differently (5e-06 vs 5e-6).
+
+Results extracted with build_tree=False carry the flat leveled headings instead of
+the nested outline. write_outline_stream() turns those into the nested JSON text
+node by node, byte-identical to dumping the built tree, without materialising the
+tree or the full document string.
+
+ResultStreamWriter collects the results of a whole run as NDJSON (one compact JSON
+object per line) in one file, a series of size-rotated files, or stdout.
+"""
+
+import gzip
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+OUTPUT_FORMATS = ("pretty", "compact")
+
+
+def dumps_outline(outline_data: Dict[str, Any], output_format: str = "pretty") -> str:
+    """Serialises a nested outline dict in the given output format."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    if output_format == "compact":
+        return _dumps_compact(outline_data).decode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(outline_data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(outline_data, indent=2, ensure_ascii=False)
+
+
+def _dumps_compact(data: Dict[str, Any]) -> bytes:
+    """Compact UTF-8 JSON; the same bytes with or without orjson unless data holds floats."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_outline(f: TextIO, outline_data: Dict[str, Any], output_format: str = "pretty"):
+    """
+    Writes an extraction result to a text file: nested outlines are dumped whole,
+    flat results (with "headings") are streamed via write_outline_stream.
+    """
+    if "headings" in outline_data:
+        write_outline_stream(f, outline_data["title"], outline_data["headings"], output_format)
+    else:
+        f.write(dumps_outline(outline_data, output_format))
+
+
+def write_outline_stream(f: TextIO, title: str, headings: Iterable[Dict[str, Any]],
+                         output_format: str = "pretty"):
+    """
+    Writes {"title": ..., "outline": [...]} for flat leveled headings, nesting them
+    exactly like PDFOutlineExtractor._build_hierarchical_outline.
+
+    A node's "children" list can only be opened or closed once the next heading is
+    known, so one heading of lookahead is kept; nothing else is buffered.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    pretty = output_format == "pretty"
+    key_sep = ": " if pretty else ":"
+
+    def newline(indent: int) -> str:
+        return "\n" + "  " * indent if pretty else ""
+
+    def encode(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def close_children(depth: int):
+        # Ends the children list of the open node at `depth`, then the node itself
+        indent = 2 + 2 * depth
+        f.write(newline(indent + 1) + "]" + newline(indent) + "}")
+
+    f.write("{" + newline(1) + '"title"' + key_sep + encode(title) + "," + newline(1) + '"outline"' + key_sep)
+
+    # Depth of each heading in the tree, computed with the same level path as the tree builder
+    path = []
+    previous = None
+    previous_depth = -1
+    for heading in headings:
+        level_num = int(heading["level"][1:])
+        while len(path) >= level_num:
+            path.pop()
+        depth = len(path)
+        path.append(level_num)
+
+        if previous is None:
+            f.write("[")
+        else:
+            _write_node(f, previous, previous_depth, depth > previous_depth, newline, key_sep, encode)
+            for open_depth in range(previous_depth - 1, depth - 1, -1):
+                close_children(open_depth)
+            if depth <= previous_depth:
+                f.write(",")
+        previous, previous_depth = heading, depth
+
+    if previous is None:
+        f.write("[]")
+    else:
+        _write_node(f, previous, previous_depth, False, newline, key_sep, encode)
+        for open_depth in range(previous_depth - 1, -1, -1):
+            close_children(open_depth)
+        f.write(newline(1) + "]")
+    f.write(newline(0) + "}")
+
+
+def _write_node(f: TextIO, heading: Dict[str, Any], depth: int, has_children: bool, newline, key_sep: str,
+                encode):
+    """Writes one outline node up to its children list, which stays open when it has children."""
+    indent = 2 + 2 * depth
+    f.write(newline(indent) + "{")
+    for key in ("level", "text", "page"):
+        f.write(newline(indent + 1) + f'"{key}"' + key_sep + encode(heading[key]) + ",")
+    f.write(newline(indent + 1) + '"children"' + key_sep)
+    if has_children:
+        f.write("[")
+    else:
+        f.write("[]" + newline(indent) + "}")
+
+
+def _drop_torn_line(f: BinaryIO, block_size: int = 64 * 1024):
+    """Truncates a file opened with "a+b" after its last newline (to empty if it has none)."""
+    pos = end = f.seek(0, os.SEEK_END)
+    while pos > 0:
+        start = max(pos - block_size, 0)
+        f.seek(start)
+        newline = f.read(pos - start).rfind(b"\n")
+        if newline >= 0:
+            pos = start + newline + 1
+            break
+        pos = start
+    if pos != end:
+        f.truncate(pos)
+
+
+class ResultStreamWriter:
+    """
+    Appends one compact JSON line per document to an NDJSON stream.
+
+    path "-" writes to standard output. gzip compresses the stream (every run adds a
+    gzip member, which readers such as gzip.open or zcat treat as one stream).
+    With max_bytes set, the output is split into numbered parts
+    (results.ndjson -> results.00000.ndjson, results.00001.ndjson, ...) of at most
+    about that many uncompressed bytes each; a new run always starts a new part, so
+    existing parts are never rewritten.
+
+    Appending to an uncompressed file first cuts it back to its last newline, dropping
+    a line left unfinished by a crashed run. A gzip stream cannot be repaired that way
+    (see flush), so resumed gzip runs need rotation.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, gzip_output: bool = False):
+        if max_bytes is not None and path == "-":
+            raise ValueError("Rotation needs a file path, not stdout")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.gzip_output = gzip_output
+        self._file: Optional[BinaryIO] = None
+        self._written = 0
+        self._part = self._last_part() + 1 if max_bytes is not None else None
+        self._open()
+
+    def _part_path(self, part: int) -> Path:
+        path = Path(self.path)
+        stem, dot, suffixes = path.name.partition(".")
+        return path.with_name(f"{stem}.{part:05d}{dot}{suffixes}")
+
+    def _last_part(self) -> int:
+        """Index of the highest existing part, or -1."""
+        path = Path(self.path)
+        stem, dot, suffixes = path.name.partition(".")
+        if not path.parent.is_dir():
+            return -1
+        pattern = re.compile(re.escape(stem) + r"\.(\d{5})" + re.escape(dot + suffixes) + "$")
+        parts = [int(match.group(1)) for match in map(pattern.match, os.listdir(path.parent)) if match]
+        return max(parts, default=-1)
+
+    def _open(self):
+        if self.path == "-":
+            # Duplicate the stdout descriptor so progress messages redirected away from
+            # sys.stdout can never interleave with the stream
+            raw = os.fdopen(os.dup(1), "wb")
+        else:
+            target = self._part_path(self._part) if self._part is not None else Path(self.path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if self.gzip_output:
+                raw = open(target, "ab")
+            else:
+                raw = open(target, "a+b")
+                _drop_torn_line(raw)
+        self._file = gzip.GzipFile(fileobj=raw, mode="ab") if self.gzip_output else raw
+        self._raw = raw
+        self._written = 0
+
+    def _close_file(self):
+        self._file.close()
+        if self._file is not self._raw:
+            self._raw.close()
+
+    def write(self, record: Dict[str, Any]):
+        """Appends one record as a line, rotating to the next part when the current one is full."""
+        line = _dumps_compact(record) + b"\n"
+        if self.max_bytes is not None and self._written and self._written + len(line) > self.max_bytes:
+            self._close_file()
+            self._part += 1
+            self._open()
+        self._file.write(line)
+        self._written += len(line)
+        if self.path == "-":
+            # Let downstream readers of a pipe see every document as soon as it is done
+            self.flush()
+
+    def flush(self, fsync: bool = False):
+        """
+        Pushes every written line to the OS (through a gzip sync flush when
+        compressing), and with fsync to stable storage.
+
+        Call this before recording a document as done elsewhere, e.g. in a checkpoint
+        manifest. A run killed afterwards leaves a gzip stream without its trailer;
+        its data is intact, but appending to it again is unsafe, so resumable gzip
+        runs should rotate (every run starts a new part).
+        """
+        self._file.flush()
+        if self._file is not self._raw:
+            self._raw.flush()
+        if fsync:
+            os.fsync(self._raw.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._close_file()
+            self._file = None
+
+    def __enter__(self) -> "ResultStreamWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
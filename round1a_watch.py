@@ -0,0 +1,170 @@
+"""
+Directory watch mode for Round 1A.
+
+Watches an input directory and extracts only PDFs that are new or modified.
+Changes are detected with inotify where available (Linux, via libc) and by
+polling file size/mtime otherwise. A file is processed once its size and mtime
+have stayed unchanged for `settle_seconds`, so partially written uploads are
+not parsed. Completed files are recorded in a small state file in the output
+directory, so a restarted watcher skips outputs that are already up to date.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from round1a_outline_extractor import PDFOutlineExtractor, save_outline
+
+STATE_FILE_NAME = ".round1a_watch_state.json"
+
+# (size, mtime_ns) of a file; a change in either means the file is still being written
+Signature = Tuple[int, int]
+
+
+class _Inotify:
+    """Minimal inotify wrapper used only as a wake-up signal for directory changes."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout: float) -> bool:
+        """Blocks until the directory changes or the timeout expires; drains pending events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _Poller:
+    """Fallback when inotify is unavailable: simply sleeps until the next scan."""
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return True
+
+    def close(self):
+        pass
+
+
+def _make_waiter(directory: str, use_inotify: bool):
+    if use_inotify:
+        try:
+            return _Inotify(directory)
+        except (OSError, AttributeError):
+            pass
+    return _Poller()
+
+
+def load_state(state_file: Path) -> Dict[str, Signature]:
+    """Reads the completed-file state; a missing or corrupt file means an empty state."""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return {name: tuple(sig) for name, sig in json.load(f).items()}
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+def save_state(state_file: Path, state: Dict[str, Signature]):
+    """Atomically replaces the state file."""
+    fd, tmp_path = tempfile.mkstemp(dir=state_file.parent, prefix=state_file.name, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f, sort_keys=True)
+    os.replace(tmp_path, state_file)
+
+
+def _scan(input_path: Path) -> Dict[str, Signature]:
+    signatures = {}
+    for pdf_file in input_path.glob("*.pdf"):
+        try:
+            stat = pdf_file.stat()
+        except OSError:
+            continue  # removed between glob and stat
+        signatures[pdf_file.name] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+
+def watch_pdfs(input_dir: str, output_dir: str, extractor: Optional[PDFOutlineExtractor] = None,
+               poll_interval: float = 2.0, settle_seconds: float = 2.0, use_inotify: bool = True,
+               state_file: Optional[str] = None, max_idle_seconds: Optional[float] = None,
+               output_format: str = "pretty"):
+    """
+    Processes new or modified PDFs in input_dir until interrupted.
+
+    With inotify the watcher wakes up on directory events and rescans at least every
+    poll_interval seconds to finish debouncing; otherwise it polls at that interval.
+    max_idle_seconds stops the watcher after that long without any pending work.
+    output_format is "pretty" or "compact" (see round1a_output).
+    """
+    extractor = extractor or PDFOutlineExtractor()
+    input_path = Path(input_dir)
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    state_path = Path(state_file) if state_file else output_path / STATE_FILE_NAME
+    completed = load_state(state_path)
+
+    # name -> (signature, time it was first seen with that signature)
+    pending: Dict[str, Tuple[Signature, float]] = {}
+    waiter = _make_waiter(str(input_path), use_inotify)
+    idle_since = time.monotonic()
+    print(f"👀 Watching '{input_dir}' ({'inotify' if isinstance(waiter, _Inotify) else 'polling'})")
+    try:
+        while True:
+            now = time.monotonic()
+            for name, signature in _scan(input_path).items():
+                output_file = output_path / f"{Path(name).stem}.json"
+                if completed.get(name) == signature and output_file.exists():
+                    pending.pop(name, None)
+                    continue
+                seen = pending.get(name)
+                if seen is None or seen[0] != signature:
+                    pending[name] = (signature, now)  # new or still changing: restart the settle timer
+                    continue
+                if now - seen[1] < settle_seconds:
+                    continue
+
+                pdf_file = input_path / name
+                print(f"Processing {name}...")
+                outline_data = extractor.extract_outline(str(pdf_file))
+                save_outline(output_path, pdf_file, outline_data, output_format)
+                completed[name] = signature
+                save_state(state_path, completed)
+                del pending[name]
+
+            if pending:
+                idle_since = time.monotonic()
+            elif max_idle_seconds is not None and time.monotonic() - idle_since >= max_idle_seconds:
+                return
+            # While files are settling, rescan soon; otherwise wait for the next event
+            waiter.wait(min(poll_interval, settle_seconds) if pending else poll_interval)
+    finally:
+        waiter.close()
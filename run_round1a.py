@@ -3,50 +3,189 @@
 Runner script for Round 1A - PDF Outline Extraction
 """
 
+import argparse
 import os
+import re
 import sys
+from functools import partial
 from pathlib import Path
-from round1a_outline_extractor import process_pdfs
+from round1a_cache import DEFAULT_MAX_BYTES, OutlineCache, default_cache_dir
+from round1a_outline_extractor import PDFOutlineExtractor, process_pdfs
+from round1a_watch import watch_pdfs
+
+def positive_float(value: str) -> float:
+    """argparse type for options that must be greater than zero."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def parse_args():
+    """Parses the command line; both directories are optional positionals."""
+    parser = argparse.ArgumentParser(description="Round 1A - PDF Outline Extraction")
+    # Default directories
+    parser.add_argument("input_dir", nargs="?", default="/app/input")
+    parser.add_argument("output_dir", nargs="?", default="/app/output")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="number of worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument("--page-workers", type=int, default=1,
+                        help="processes used to split the pages of one large PDF (default: 1)")
+    parser.add_argument("--use-toc", action="store_true",
+                        help="use the PDF's embedded bookmarks as the outline when available")
+    parser.add_argument("--input-mode", choices=("path", "bytes", "mmap"), default="path",
+                        help="how PDFs are handed to the parser: by path, loaded as bytes, or memory-mapped "
+                             "(same as path where PyMuPDF only accepts bytes streams)")
+    parser.add_argument("--output-format", choices=("pretty", "compact"), default="pretty",
+                        help="indented or compact JSON outlines (default: %(default)s)")
+    parser.add_argument("--stream-output", action="store_true",
+                        help="write each outline node by node instead of building the nested tree first")
+    parser.add_argument("--results", metavar="PATH",
+                        help="append one NDJSON line per document to PATH ('-' = stdout) instead of per-file outlines")
+    parser.add_argument("--results-max-mb", type=int,
+                        help="split the results stream into numbered parts of about this size")
+    parser.add_argument("--results-gzip", action="store_true",
+                        help="gzip-compress the results stream")
+    parser.add_argument("--timeout", type=float,
+                        help="kill and fail the extraction of a document after this many seconds")
+    parser.add_argument("--max-pages", type=int,
+                        help="fail documents with more than this many pages")
+    parser.add_argument("--max-spans", type=int,
+                        help="fail documents with more than this many text spans")
+    parser.add_argument("--streaming", action="store_true",
+                        help="bounded-memory two-pass extraction for very large PDFs")
+    parser.add_argument("--body-sample-pages", type=int,
+                        help="with --streaming, estimate the body text style from this many pages "
+                             "spread over the document (full pass if the sample is inconclusive)")
+    parser.add_argument("--heading-pattern", action="append", default=[], metavar="REGEX",
+                        help="extra regex for heading numbering, matched at the start of a span (repeatable)")
+    parser.add_argument("--suppress-repeated", action="store_true",
+                        help="ignore text repeated at the same position on many pages (running heads, page numbers)")
+    parser.add_argument("--repeat-min-pages", type=int, default=3,
+                        help="repeated text must occur on at least this many pages (default: %(default)s)")
+    parser.add_argument("--repeat-min-ratio", type=float, default=0.4,
+                        help="... and on at least this fraction of the pages (default: %(default)s)")
+    parser.add_argument("--repeat-tolerance", type=positive_float, default=5.0,
+                        help="vertical position tolerance in points for repeated text (default: %(default)s)")
+    parser.add_argument("--max-levels", type=int,
+                        help="cluster heading sizes into at most this many levels (H1..Hn)")
+    parser.add_argument("--level-tolerance", type=float, default=0.0,
+                        help="heading sizes this many points apart share a level (default: %(default)s)")
+    parser.add_argument("--metrics", choices=("sidecar", "summary"),
+                        help="write per-file <stem>.metrics.json sidecars or one aggregated run_metrics.json")
+    parser.add_argument("--manifest",
+                        help="checkpoint file; a restarted run skips inputs already completed in it")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and process new or modified PDFs as they appear")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="watch mode: seconds between rescans (default: %(default)s)")
+    parser.add_argument("--settle-seconds", type=float, default=2.0,
+                        help="watch mode: a file must be unchanged this long before it is processed (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=str(default_cache_dir()),
+                        help="directory of the outline result cache (default: %(default)s)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="evict least recently used cache entries beyond this size (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass the result cache and re-extract every PDF")
+    parser.add_argument("--purge-cache", action="store_true",
+                        help="delete all cached results before processing")
+    args = parser.parse_args()
+    if args.watch:
+        # Watch mode writes per-file outlines from a single process
+        unsupported = [flag for flag, value in (("--results", args.results), ("--metrics", args.metrics),
+                                                ("--manifest", args.manifest), ("--workers", args.workers != 1))
+                       if value]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be combined with --watch")
+    try:
+        # Fail before any work starts, with the same checks the extractor applies
+        scratch = PDFOutlineExtractor()
+        for pattern in args.heading_pattern:
+            scratch.register_heading_pattern(pattern)
+    except re.error as e:
+        parser.error(f"invalid --heading-pattern {pattern!r}: {e}")
+    if args.body_sample_pages and not args.streaming:
+        parser.error("--body-sample-pages only applies with --streaming")
+    if args.results and args.stream_output:
+        parser.error("--stream-output applies to per-file outlines, not to --results")
+    if args.results == "-" and args.results_max_mb:
+        parser.error("--results-max-mb needs a file path, not stdout")
+    if args.manifest and args.results not in (None, "-") and args.results_gzip and not args.results_max_mb:
+        parser.error("--results-gzip with --manifest needs --results-max-mb, so a resumed run starts a new part")
+    return args
+
+def build_extractor(args, cache):
+    """The extractor configured from the command line, shared by batch and watch mode."""
+    extractor = PDFOutlineExtractor(page_workers=args.page_workers, cache=cache, use_embedded_toc=args.use_toc,
+                                    streaming=args.streaming, max_heading_levels=args.max_levels,
+                                    level_size_tolerance=args.level_tolerance, input_mode=args.input_mode,
+                                    build_tree=not args.stream_output, timeout=args.timeout,
+                                    max_pages=args.max_pages, max_spans=args.max_spans,
+                                    body_sample_pages=args.body_sample_pages,
+                                    suppress_repeated_text=args.suppress_repeated,
+                                    repeat_min_pages=args.repeat_min_pages, repeat_min_ratio=args.repeat_min_ratio,
+                                    repeat_y_tolerance=args.repeat_tolerance)
+    for pattern in args.heading_pattern:
+        extractor.register_heading_pattern(pattern)
+    return extractor
 
 def main():
     """Main function to run Round 1A"""
-    # Default directories
-    input_dir = "/app/input"
-    output_dir = "/app/output"
-    
-    # Check if custom directories are provided
-    if len(sys.argv) >= 2:
-        input_dir = sys.argv[1]
-    if len(sys.argv) >= 3:
-        output_dir = sys.argv[2]
+    args = parse_args()
+    # With --results - stdout carries the result stream, so messages go to stderr
+    log = partial(print, file=sys.stderr) if args.results == "-" else print
+    input_dir = args.input_dir
+    output_dir = args.output_dir
     
+    cache = OutlineCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+    if args.purge_cache:
+        log(f"🧹 Purged {cache.purge()} cached result(s) from '{cache.cache_dir}'")
+    if args.no_cache:
+        cache = None
+
     # Validate input directory
     if not os.path.exists(input_dir):
-        print(f"❌ Input directory '{input_dir}' does not exist!")
-        print("Please create the directory and add PDF files to process.")
+        log(f"❌ Input directory '{input_dir}' does not exist!")
+        log("Please create the directory and add PDF files to process.")
         sys.exit(1)
     
+    if args.watch:
+        extractor = build_extractor(args, cache)
+        try:
+            watch_pdfs(input_dir, output_dir, extractor, poll_interval=args.poll_interval,
+                       settle_seconds=args.settle_seconds, output_format=args.output_format)
+        except KeyboardInterrupt:
+            log("\n👋 Stopped watching.")
+        return
+
     # Check for PDF files
     pdf_files = list(Path(input_dir).glob("*.pdf"))
     if not pdf_files:
-        print(f"❌ No PDF files found in '{input_dir}'!")
-        print("Please add PDF files to the input directory.")
+        log(f"❌ No PDF files found in '{input_dir}'!")
+        log("Please add PDF files to the input directory.")
         sys.exit(1)
     
-    print(f"🔍 Found {len(pdf_files)} PDF file(s) to process:")
+    log(f"🔍 Found {len(pdf_files)} PDF file(s) to process:")
     for pdf_file in pdf_files:
-        print(f"  - {pdf_file.name}")
+        log(f"  - {pdf_file.name}")
     
-    print(f"\n📁 Input directory: {input_dir}")
-    print(f"📁 Output directory: {output_dir}")
+    log(f"\n📁 Input directory: {input_dir}")
+    log(f"📁 Output directory: {output_dir}")
+    if args.workers != 1:
+        log(f"⚙️  Worker processes: {args.workers or os.cpu_count()}")
     
     # Process PDFs
-    print("\n🚀 Starting Round 1A processing...")
-    process_pdfs(input_dir, output_dir)
+    log("\n🚀 Starting Round 1A processing...")
+    process_pdfs(input_dir, output_dir, build_extractor(args, cache), workers=args.workers, metrics=args.metrics,
+                 manifest=args.manifest, output_format=args.output_format, results=args.results,
+                 results_max_bytes=args.results_max_mb * 1024 * 1024 if args.results_max_mb else None,
+                 results_gzip=args.results_gzip)
 
     
-    print("\n✅ Round 1A processing complete!")
-    print(f"Check the '{output_dir}' directory for JSON output files.")
+    log("\n✅ Round 1A processing complete!")
+    if args.results:
+        log(f"Results written to {'stdout' if args.results == '-' else args.results}.")
+    else:
+        log(f"Check the '{output_dir}' directory for JSON output files.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import fitz
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def sample_pdf(tmp_path) -> Path:
+    """A small PDF with a title, two bold heading levels and body text."""
+    path = tmp_path / "sample.pdf"
+    with fitz.open() as doc:
+        for number in range(1, 3):
+            page = doc.new_page()
+            y = 72
+            if number == 1:
+                page.insert_text((72, y), "Annual Market Report", fontname="hebo", fontsize=24)
+                y += 40
+            page.insert_text((72, y), f"Chapter {number}: Overview", fontname="hebo", fontsize=18)
+            y += 30
+            page.insert_text((72, y), f"{number}.1 Regional Results", fontname="hebo", fontsize=14)
+            y += 24
+            for _ in range(12):
+                page.insert_text((72, y), "the river market stays open late in the summer season",
+                                 fontname="helv", fontsize=11)
+                y += 16
+        doc.save(str(path))
+    return path
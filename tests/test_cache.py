@@ -0,0 +1,73 @@
+import json
+import os
+
+from round1a_cache import OutlineCache
+from round1a_outline_extractor import PDFOutlineExtractor, _error_outline
+
+
+def _outline(i):
+    return {"title": f"Document {i}", "outline": []}
+
+
+def test_lru_eviction(tmp_path):
+    entry_size = len(json.dumps(_outline(0)).encode("utf-8"))
+    cache = OutlineCache(str(tmp_path), max_bytes=int(entry_size * 3.5))
+    keys = ["aa0", "bb1", "cc2", "dd3"]
+    for age, key in enumerate(keys[:3]):
+        cache.put(key, _outline(age))
+        # Distinct, old mtimes, so the order does not depend on the clock resolution
+        os.utime(cache._entry_path(key), (1_000_000 + age, 1_000_000 + age))
+
+    # A hit makes the oldest entry the most recently used one
+    assert cache.get("aa0") == _outline(0)
+    cache.put("dd3", _outline(3))
+
+    assert cache.get("bb1") is None
+    for i in (0, 2, 3):
+        assert cache.get(keys[i]) == _outline(i)
+
+
+def test_purge(tmp_path):
+    cache = OutlineCache(str(tmp_path))
+    cache.put("aa0", _outline(0))
+    cache.put("bb1", _outline(1))
+    assert cache.purge() == 2
+    assert cache.get("aa0") is None
+
+
+def test_config_changes_key(sample_pdf, tmp_path):
+    cache = OutlineCache(str(tmp_path))
+    default = PDFOutlineExtractor()
+    flat = PDFOutlineExtractor(build_tree=False)
+    assert cache.key(str(sample_pdf), default._cache_config()) != cache.key(str(sample_pdf), flat._cache_config())
+    assert cache.key(str(sample_pdf), default._cache_config()) == cache.key(sample_pdf.read_bytes(),
+                                                                           default._cache_config())
+
+
+def test_unusable_cache_falls_back_to_extraction(sample_pdf):
+    expected = PDFOutlineExtractor().extract_outline(str(sample_pdf))
+    assert expected["outline"]
+
+    extractor = PDFOutlineExtractor(cache=OutlineCache("/dev/null/cache"))
+    assert extractor.extract_outline(str(sample_pdf)) == expected
+    assert extractor.extract_outline(str(sample_pdf)) != _error_outline()
+    [(_, result, error)] = extractor.extract_many([str(sample_pdf)])
+    assert error is None
+    assert result == expected
+
+
+def test_cache_hit_returns_same_outline(sample_pdf, tmp_path):
+    extractor = PDFOutlineExtractor(cache=OutlineCache(str(tmp_path / "cache")))
+    first = extractor.extract_outline(str(sample_pdf))
+    assert list((tmp_path / "cache").glob("*/*.json"))
+    assert extractor.extract_outline(str(sample_pdf)) == first
+
+
+def test_body_sample_only_keys_streaming_configs(sample_pdf, tmp_path):
+    cache = OutlineCache(str(tmp_path))
+
+    def key(**options):
+        return cache.key(str(sample_pdf), PDFOutlineExtractor(**options)._cache_config())
+
+    assert key(body_sample_pages=1) == key()
+    assert key(streaming=True, body_sample_pages=1) != key(streaming=True)
@@ -0,0 +1,31 @@
+import pytest
+
+import round1a_outline_extractor
+from round1a_outline_extractor import PDFOutlineExtractor, SpanTable
+
+SPANS = [
+    ("Annual Market Report", 24.0, "Helvetica-Bold"),
+    ("Chapter 1: Overview", 18.0, "Helvetica-Bold"),
+    ("1.1 Regional Results", 11.0, "Helvetica-Bold"),
+    ("the river market stays open late.", 11.0, "Helvetica"),
+    ("ÉTUDE DE MARCHÉ", 14.0, "Helvetica"),
+    ("ok", 24.0, "Helvetica-Bold"),
+    ("x" * 251, 24.0, "Helvetica-Bold"),
+    ("Two Words", 12.0, "Helvetica"),
+    ("Methods And Data", 13.0, "Helvetica"),
+    ("2.3 appendix tables", 11.0, "Helvetica"),
+    ("Summary Of Findings", 11.0, "Helvetica-Bold"),
+]
+
+
+@pytest.mark.skipif(round1a_outline_extractor.np is None, reason="needs NumPy")
+@pytest.mark.parametrize("excluded", [None, [], [0, 4]])
+def test_vectorized_matches_scalar(monkeypatch, excluded):
+    spans = SpanTable()
+    for page, (text, font_size, font) in enumerate(SPANS, 1):
+        spans.append(text, font_size, font, page)
+    extractor = PDFOutlineExtractor()
+    vectorized = extractor._find_headings(spans, 11.0, excluded)
+    monkeypatch.setattr(round1a_outline_extractor, "np", None)
+    assert extractor._find_headings(spans, 11.0, excluded) == vectorized
+    assert vectorized
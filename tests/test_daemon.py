@@ -0,0 +1,61 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from round1a_daemon import ExtractionHTTPServer, ExtractionService
+from round1a_outline_extractor import PDFOutlineExtractor
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = ExtractionService(PDFOutlineExtractor(), workers=1, max_queue=4)
+    httpd = ExtractionHTTPServer(("127.0.0.1", 0), service, max_upload_bytes=1 << 20)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    service.shutdown()
+
+
+def _post(server, body: bytes, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    connection.putrequest("POST", "/extract")
+    for name, value in (headers or {"Content-Length": str(len(body))}).items():
+        connection.putheader(name, value)
+    connection.endheaders()
+    connection.send(body)
+    response = connection.getresponse()
+    try:
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("body", [b'{"path": null}', b'{"path": ["x.pdf"]}', b'{"path": 5}', b"[]", b"{",
+                                  b"{}"])
+def test_bad_json_request(server, body):
+    status, _ = _post(server, body)
+    assert status == 400
+
+
+@pytest.mark.parametrize("length", ["abc", "-3"])
+def test_bad_content_length(server, length):
+    status, data = _post(server, b"{}", {"Content-Length": length})
+    assert status == 400
+    assert data == {"error": "invalid Content-Length"}
+
+
+def test_missing_file(server, tmp_path):
+    status, _ = _post(server, json.dumps({"path": str(tmp_path / "missing.pdf")}).encode())
+    assert status == 404
+
+
+def test_extract_by_path_and_upload(server, sample_pdf):
+    expected = PDFOutlineExtractor().extract_outline(str(sample_pdf))
+    assert _post(server, json.dumps({"path": str(sample_pdf)}).encode()) == (200, expected)
+    upload = sample_pdf.read_bytes()
+    headers = {"Content-Type": "application/pdf", "Content-Length": str(len(upload))}
+    assert _post(server, upload, headers) == (200, expected)
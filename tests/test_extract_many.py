@@ -0,0 +1,59 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from round1a_outline_extractor import ExtractionMetrics, PDFOutlineExtractor
+
+
+@pytest.fixture
+def sources(sample_pdf):
+    data = sample_pdf.read_bytes()
+    return [sample_pdf, str(sample_pdf), io.BytesIO(data), memoryview(data), bytearray(data)]
+
+
+def test_serial_order_and_original_sources(sources):
+    expected = PDFOutlineExtractor().extract_outline(sources[0])
+    results = list(PDFOutlineExtractor().extract_many(sources))
+    assert [source for source, _, _ in results] == sources
+    assert all(source is original for (source, _, _), original in zip(results, sources))
+    assert all(result == expected and error is None for _, result, error in results)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_pool_yields_every_source(sources, ordered):
+    results = list(PDFOutlineExtractor().extract_many(sources, workers=2, ordered=ordered, chunksize=2))
+    yielded = [source for source, _, _ in results]
+    if ordered:
+        assert yielded == sources
+    assert sorted(map(id, yielded)) == sorted(map(id, sources))
+    assert all(error is None for _, _, error in results)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_errors_do_not_stop_the_batch(sample_pdf, workers):
+    sources = [str(sample_pdf), 42, b"not a pdf", str(sample_pdf)]
+    results = list(PDFOutlineExtractor().extract_many(sources, workers=workers, chunksize=2))
+    assert [source for source, _, _ in results] == sources
+    assert [result is None for _, result, _ in results] == [False, True, True, False]
+    assert results[1][2].startswith("TypeError")
+    assert results[2][2] is not None
+
+
+def test_metrics_are_added_to_the_callers_sink(sample_pdf):
+    metrics = ExtractionMetrics()
+    extractor = PDFOutlineExtractor(metrics=metrics)
+    list(extractor.extract_many([str(sample_pdf)] * 3))
+    assert extractor.metrics is metrics
+    assert metrics.counters["pages"] == 6
+
+
+def test_foreign_executors_use_this_extractors_settings(sample_pdf):
+    flat = PDFOutlineExtractor(build_tree=False)
+    expected = flat.extract_outline(str(sample_pdf))
+    with ThreadPoolExecutor(2) as executor:
+        [(_, result, error)] = flat.extract_many([str(sample_pdf)], workers=2, executor=executor)
+    assert error is None and result == expected
+    with PDFOutlineExtractor().create_pool(1) as pool:
+        [(_, result, error)] = flat.extract_many([str(sample_pdf)], executor=pool)
+    assert error is None and result == expected
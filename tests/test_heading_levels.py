@@ -0,0 +1,31 @@
+from round1a_outline_extractor import PDFOutlineExtractor, Span
+
+
+def _levels(extractor, headings):
+    headings = [Span(f"Heading {i}", size, font, 1) for i, (size, font) in enumerate(headings)]
+    return [h.level for h in extractor._assign_heading_levels(headings)]
+
+
+def test_default_gives_every_size_its_own_level():
+    sizes = [(18.0, "Helvetica"), (11.98, "Helvetica"), (12.0, "Helvetica"), (12.02, "Helvetica")]
+    assert _levels(PDFOutlineExtractor(), sizes) == ["H1", "H4", "H3", "H2"]
+
+
+def test_tolerance_merges_jittered_sizes():
+    sizes = [(18.0, "Helvetica"), (11.98, "Helvetica"), (12.0, "Helvetica"), (12.02, "Helvetica")]
+    assert _levels(PDFOutlineExtractor(level_size_tolerance=0.05), sizes) == ["H1", "H2", "H2", "H2"]
+
+
+def test_max_levels_merges_closest_clusters():
+    extractor = PDFOutlineExtractor(max_heading_levels=2)
+    assert extractor._cluster_heading_sizes([24.0, 18.0, 16.0, 12.0]) == [[24.0], [18.0, 16.0, 12.0]]
+    sizes = [(24.0, "Helvetica"), (18.0, "Helvetica"), (16.0, "Helvetica"), (12.0, "Helvetica")]
+    assert _levels(extractor, sizes) == ["H1", "H2", "H2", "H2"]
+    assert PDFOutlineExtractor(max_heading_levels=3)._cluster_heading_sizes([24.0, 18.0, 16.0, 12.0]) == [
+        [24.0], [18.0, 16.0], [12.0]]
+
+
+def test_bold_weight_ranks_bold_above_same_size():
+    sizes = [(14.0, "Helvetica-Bold"), (14.0, "Helvetica"), (12.0, "Helvetica")]
+    assert _levels(PDFOutlineExtractor(bold_level_weight=1.0), sizes) == ["H1", "H2", "H3"]
+    assert _levels(PDFOutlineExtractor(), sizes) == ["H1", "H1", "H2"]
@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+from round1a_outline_extractor import PDFOutlineExtractor
+
+
+@pytest.mark.parametrize("pattern", ["(", r"(?i)^chapitre\s+\d+"])
+def test_invalid_pattern_is_rejected(pattern):
+    extractor = PDFOutlineExtractor()
+    with pytest.raises(re.error):
+        extractor.register_heading_pattern(pattern)
+    assert len(extractor.heading_patterns) == 2
+
+
+def test_duplicate_group_name_is_rejected():
+    extractor = PDFOutlineExtractor()
+    extractor.register_heading_pattern(r"^(?P<n>\d+)\)")
+    with pytest.raises(re.error):
+        extractor.register_heading_pattern(r"^(?P<n>[A-Z])\)")
+    assert len(extractor.heading_patterns) == 3
+
+
+def test_registered_pattern_classifies_headings():
+    extractor = PDFOutlineExtractor()
+    assert not extractor._is_heading_text("CHAPITRE 3 les marchés")
+    extractor.register_heading_pattern(r"^(?i:chapitre)\s+\d+")
+    assert extractor._is_heading_text("CHAPITRE 3 les marchés")
+
+
+@pytest.mark.parametrize("text", ["Chapter 1: Setup", "2.1 Methods", "IV. Results", "Appendix B tables",
+                                  "the market is open.", "Two Words", "ALL CAPS TITLE", "lower case words"])
+def test_fused_matcher_agrees_with_single_patterns(text):
+    extractor = PDFOutlineExtractor()
+    for pattern in (r"^[IVXLC]+\.\s+\S", r"^Appendix\s+[A-Z]\b"):
+        extractor.register_heading_pattern(pattern)
+    fused = extractor._heading_matcher().match(text) is not None
+    assert fused == any(re.match(pattern, text) for pattern in extractor.heading_patterns)
@@ -0,0 +1,38 @@
+import pytest
+
+from round1a_outline_extractor import PDFOutlineExtractor, _error_outline
+
+
+def _only_result(extractor, source):
+    [(_, result, error)] = extractor.extract_many([str(source)])
+    return result, error
+
+
+def test_max_pages(sample_pdf):
+    result, error = _only_result(PDFOutlineExtractor(max_pages=1), sample_pdf)
+    assert result is None
+    assert error == "ExtractionLimitExceeded: document has 2 pages, max_pages is 1"
+    assert PDFOutlineExtractor(max_pages=1).extract_outline(str(sample_pdf)) == _error_outline()
+    assert _only_result(PDFOutlineExtractor(max_pages=2), sample_pdf)[1] is None
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_max_spans(sample_pdf, streaming):
+    result, error = _only_result(PDFOutlineExtractor(max_spans=5, streaming=streaming), sample_pdf)
+    assert result is None
+    assert error.startswith("ExtractionLimitExceeded: more than max_spans=5")
+    assert _only_result(PDFOutlineExtractor(max_spans=1000, streaming=streaming), sample_pdf)[1] is None
+
+
+def test_timeout_kills_the_extraction(sample_pdf):
+    # Starting the isolated child alone takes longer than a microsecond
+    result, error = _only_result(PDFOutlineExtractor(timeout=1e-6), sample_pdf)
+    assert result is None
+    assert error == "TimeoutError: extraction exceeded 1e-06s"
+
+
+def test_isolated_extraction_matches_in_process(sample_pdf):
+    expected = PDFOutlineExtractor().extract_outline(str(sample_pdf))
+    assert PDFOutlineExtractor(timeout=60).extract_outline(str(sample_pdf)) == expected
+    results = list(PDFOutlineExtractor(timeout=60).extract_many([str(sample_pdf)] * 3, workers=2))
+    assert [(result, error) for _, result, error in results] == [(expected, None)] * 3
@@ -0,0 +1,61 @@
+import os
+
+from round1a_manifest import CheckpointManifest
+
+
+def _inputs(tmp_path):
+    inputs = []
+    for name in ("a.pdf", "b.pdf"):
+        path = tmp_path / name
+        path.write_bytes(b"%PDF-1.4 " + name.encode())
+        inputs.append(path)
+    return inputs
+
+
+def test_reload_after_truncated_line(tmp_path):
+    manifest_path = tmp_path / "manifest.jsonl"
+    a, b = _inputs(tmp_path)
+    with CheckpointManifest(str(manifest_path)) as manifest:
+        manifest.record(a, "ok", 0.1)
+        manifest.record(b, "error", 0.2, error="ValueError: broken")
+    # A run killed in the middle of a write leaves a torn last line
+    with open(manifest_path, "ab") as f:
+        f.write(b'{"input": "' + str(a).encode() + b'", "size": 1')
+
+    with CheckpointManifest(str(manifest_path)) as manifest:
+        assert manifest.is_complete(a)
+        assert not manifest.is_complete(b)
+        assert manifest.entries[str(b.resolve())]["error"] == "ValueError: broken"
+    # Opening compacts the journal, dropping the torn line
+    assert len(manifest_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_changed_input_is_redone(tmp_path):
+    a, _ = _inputs(tmp_path)
+    with CheckpointManifest(str(tmp_path / "manifest.jsonl")) as manifest:
+        manifest.record(a, "ok", 0.1)
+        a.write_bytes(b"%PDF-1.4 changed")
+        assert not manifest.is_complete(a)
+
+
+def test_missing_output_is_redone(tmp_path):
+    a, _ = _inputs(tmp_path)
+    with CheckpointManifest(str(tmp_path / "manifest.jsonl")) as manifest:
+        manifest.record(a, "ok", 0.1)
+        output = tmp_path / "a.json"
+        assert not manifest.is_complete(a, output)
+        output.write_text("{}", encoding="utf-8")
+        assert manifest.is_complete(a, output)
+
+
+def test_entries_keyed_by_resolved_path(tmp_path, monkeypatch):
+    a, _ = _inputs(tmp_path)
+    manifest_path = tmp_path / "manifest.jsonl"
+    with CheckpointManifest(str(manifest_path)) as manifest:
+        manifest.record(a, "ok", 0.1)
+
+    monkeypatch.chdir(tmp_path)
+    relative = a.relative_to(tmp_path)
+    assert not os.path.isabs(relative)
+    with CheckpointManifest(str(manifest_path)) as manifest:
+        assert manifest.is_complete(relative)
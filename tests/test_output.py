@@ -0,0 +1,80 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from round1a_outline_extractor import PDFOutlineExtractor, Span
+from round1a_output import OUTPUT_FORMATS, ResultStreamWriter, dumps_outline, write_outline_stream
+
+LEVEL_SEQUENCES = [
+    [],
+    ["H1"],
+    ["H1", "H2", "H3"],
+    ["H1", "H3", "H2"],
+    ["H2", "H1", "H2"],
+    ["H3", "H3", "H1", "H4", "H2"],
+    ["H1", "H4", "H4", "H1", "H2", "H5", "H3"],
+    ["H2", "H2", "H2"],
+]
+
+
+def _headings(levels):
+    return [Span(f"Heading {i} – «{level}»", 12.0, "Helvetica", i + 1, level=level)
+            for i, level in enumerate(levels)]
+
+
+def _expected(title, headings, output_format):
+    outline = {"title": title, "outline": PDFOutlineExtractor()._build_hierarchical_outline(headings)}
+    if output_format == "pretty":
+        return json.dumps(outline, indent=2, ensure_ascii=False)
+    return json.dumps(outline, separators=(",", ":"), ensure_ascii=False)
+
+
+@pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+@pytest.mark.parametrize("levels", LEVEL_SEQUENCES, ids=lambda levels: "-".join(levels) or "empty")
+def test_stream_matches_built_tree(levels, output_format):
+    headings = _headings(levels)
+    flat = [{"level": h.level, "text": h.text, "page": h.page} for h in headings]
+    f = io.StringIO()
+    write_outline_stream(f, "Rapport «annuel»", flat, output_format)
+    assert f.getvalue() == _expected("Rapport «annuel»", headings, output_format)
+
+
+@pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+def test_dumps_outline_matches_json(output_format):
+    headings = _headings(["H1", "H3", "H2"])
+    outline = {"title": "Title", "outline": PDFOutlineExtractor()._build_hierarchical_outline(headings)}
+    assert dumps_outline(outline, output_format) == _expected("Title", headings, output_format)
+
+
+def test_unknown_output_format():
+    with pytest.raises(ValueError):
+        write_outline_stream(io.StringIO(), "Title", [], "yaml")
+
+
+def test_result_stream_rotation(tmp_path):
+    path = tmp_path / "results.ndjson.gz"
+    records = [{"path": f"doc{i}.pdf", "outline": [], "error": None} for i in range(10)]
+    with ResultStreamWriter(str(path), max_bytes=100, gzip_output=True) as writer:
+        for record in records:
+            writer.write(record)
+
+    parts = sorted(tmp_path.glob("results.*.ndjson.gz"))
+    assert len(parts) > 1
+    lines = [line for part in parts for line in gzip.open(part, "rt", encoding="utf-8")]
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_result_stream_drops_torn_line(tmp_path):
+    path = tmp_path / "results.ndjson"
+    path.write_bytes(b'{"path":"a.pdf"}\n{"path":"b.p')
+    with ResultStreamWriter(str(path)) as writer:
+        writer.write({"path": "b.pdf"})
+    assert [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()] == [
+        {"path": "a.pdf"}, {"path": "b.pdf"}]
+
+
+def test_stdout_stream_cannot_rotate():
+    with pytest.raises(ValueError):
+        ResultStreamWriter("-", max_bytes=100)
@@ -0,0 +1,18 @@
+from round1a_outline_extractor import ExtractionMetrics, PDFOutlineExtractor
+
+
+def test_split_page_range():
+    extractor = PDFOutlineExtractor(page_workers=3)
+    assert extractor._split_page_range(PDFOutlineExtractor.MIN_PAGES_PER_WORKER * 2) == [(0, 32), (32, 64)]
+    assert extractor._split_page_range(100) == [(0, 33), (33, 66), (66, 100)]
+    assert extractor._split_page_range(40) == [(0, 40)]
+
+
+def test_page_workers_match_serial_extraction(sample_pdf, monkeypatch):
+    expected = PDFOutlineExtractor().extract_outline(str(sample_pdf))
+    monkeypatch.setattr(PDFOutlineExtractor, "MIN_PAGES_PER_WORKER", 1)
+    metrics = ExtractionMetrics()
+    extractor = PDFOutlineExtractor(page_workers=2, metrics=metrics)
+    assert extractor._split_page_range(2) == [(0, 1), (1, 2)]
+    assert extractor.extract_outline(str(sample_pdf)) == expected
+    assert metrics.counters["pages"] == 2
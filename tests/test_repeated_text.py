@@ -0,0 +1,83 @@
+import fitz
+import pytest
+
+from round1a_cache import OutlineCache
+from round1a_outline_extractor import PDFOutlineExtractor
+
+
+@pytest.fixture
+def furniture_pdf(tmp_path):
+    """Six pages with a bold running head and page footer; chapters start on pages 1 and 4."""
+    path = tmp_path / "furniture.pdf"
+    chapters = {1: "Chapter 1: Regional Markets", 4: "Chapter 2: Coastal Trade"}
+    with fitz.open() as doc:
+        for number in range(1, 7):
+            page = doc.new_page()
+            page.insert_text((72, 40), "Annual Report", fontname="hebo", fontsize=11)
+            if number in chapters:
+                page.insert_text((72, 100), chapters[number], fontname="hebo", fontsize=18)
+            for i in range(20):
+                page.insert_text((72, 130 + 16 * i), "the harbor market stays open late in the summer",
+                                 fontname="helv", fontsize=11)
+            page.insert_text((280, 800), f"Page {number}", fontname="hebo", fontsize=11)
+        doc.save(str(path))
+    return path
+
+
+def _texts(outline):
+    """Heading texts of a nested outline in document order."""
+    texts = []
+    stack = list(reversed(outline["outline"]))
+    while stack:
+        node = stack.pop()
+        texts.append(node["text"])
+        stack.extend(reversed(node["children"]))
+    return texts
+
+
+def test_page_furniture_is_kept_by_default(furniture_pdf):
+    texts = _texts(PDFOutlineExtractor().extract_outline(str(furniture_pdf)))
+    assert "Annual Report" in texts
+    assert "Page 3" in texts
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_page_furniture_is_suppressed(furniture_pdf, streaming):
+    extractor = PDFOutlineExtractor(streaming=streaming, suppress_repeated_text=True)
+    texts = _texts(extractor.extract_outline(str(furniture_pdf)))
+    assert texts == ["Chapter 1: Regional Markets", "Chapter 2: Coastal Trade"]
+
+
+def test_rare_text_is_not_suppressed(furniture_pdf):
+    # A ratio above 1 can never be met, so nothing counts as repeated
+    extractor = PDFOutlineExtractor(suppress_repeated_text=True, repeat_min_ratio=1.01)
+    texts = _texts(extractor.extract_outline(str(furniture_pdf)))
+    assert "Annual Report" in texts
+
+
+def test_numbered_labels_at_a_fixed_position_count_as_repeated(tmp_path):
+    # Digits are ignored, so "Chapter 1" ... "Chapter 6" at the top of every page look alike
+    path = tmp_path / "labels.pdf"
+    with fitz.open() as doc:
+        for number in range(1, 7):
+            page = doc.new_page()
+            page.insert_text((72, 100), f"Chapter {number}: Overview", fontname="hebo", fontsize=18)
+            for i in range(20):
+                page.insert_text((72, 130 + 16 * i), "the harbor market stays open late in the summer",
+                                 fontname="helv", fontsize=11)
+        doc.save(str(path))
+    assert _texts(PDFOutlineExtractor(suppress_repeated_text=True).extract_outline(str(path))) == []
+
+
+def test_streaming_is_cached_separately(furniture_pdf, tmp_path):
+    cache = OutlineCache(str(tmp_path / "cache"))
+    in_memory = PDFOutlineExtractor(cache=cache, suppress_repeated_text=True)
+    streaming = PDFOutlineExtractor(cache=cache, suppress_repeated_text=True, streaming=True)
+    assert (cache.key(str(furniture_pdf), in_memory._cache_config())
+            != cache.key(str(furniture_pdf), streaming._cache_config()))
+
+
+@pytest.mark.parametrize("tolerance", [0, -1.0])
+def test_non_positive_tolerance_is_rejected(tolerance):
+    with pytest.raises(ValueError):
+        PDFOutlineExtractor(repeat_y_tolerance=tolerance)
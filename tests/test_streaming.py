@@ -0,0 +1,19 @@
+import pytest
+
+from round1a_outline_extractor import ExtractionMetrics, PDFOutlineExtractor
+
+
+def test_streaming_matches_in_memory(sample_pdf):
+    expected = PDFOutlineExtractor().extract_outline(str(sample_pdf))
+    assert PDFOutlineExtractor(streaming=True).extract_outline(str(sample_pdf)) == expected
+
+
+@pytest.mark.parametrize("min_spans, fallbacks", [(PDFOutlineExtractor.BODY_SAMPLE_MIN_SPANS, 1), (10, 0)])
+def test_body_sample(sample_pdf, monkeypatch, min_spans, fallbacks):
+    expected = PDFOutlineExtractor(streaming=True).extract_outline(str(sample_pdf))
+    monkeypatch.setattr(PDFOutlineExtractor, "BODY_SAMPLE_MIN_SPANS", min_spans)
+    metrics = ExtractionMetrics()
+    extractor = PDFOutlineExtractor(streaming=True, body_sample_pages=1, metrics=metrics)
+    assert extractor.extract_outline(str(sample_pdf)) == expected
+    assert metrics.counters["sampled_pages"] == 1
+    assert metrics.counters.get("sample_fallbacks", 0) == fallbacks
@@ -0,0 +1,31 @@
+import fitz
+import pytest
+
+from round1a_outline_extractor import PDFOutlineExtractor
+
+
+def _with_toc(sample_pdf, tmp_path, toc):
+    path = tmp_path / "toc.pdf"
+    with fitz.open(str(sample_pdf)) as doc:
+        doc.set_toc(toc)
+        doc.save(str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_embedded_toc_is_used(sample_pdf, tmp_path, streaming):
+    path = _with_toc(sample_pdf, tmp_path, [[1, "Introduction", 1], [2, "Scope", 1], [1, "Results", 2]])
+    outline = PDFOutlineExtractor(use_embedded_toc=True, streaming=streaming).extract_outline(path)
+    assert outline["outline"] == [
+        {"level": "H1", "text": "Introduction", "page": 1,
+         "children": [{"level": "H2", "text": "Scope", "page": 1, "children": []}]},
+        {"level": "H1", "text": "Results", "page": 2, "children": []},
+    ]
+
+
+@pytest.mark.parametrize("toc", [[], [[1, "Only Bookmark", 1]]])
+def test_short_toc_falls_back_to_heuristics(sample_pdf, tmp_path, toc):
+    path = _with_toc(sample_pdf, tmp_path, toc)
+    expected = PDFOutlineExtractor().extract_outline(path)
+    assert PDFOutlineExtractor(use_embedded_toc=True).extract_outline(path) == expected
+    assert expected["outline"]